@@ -1,3 +1,4 @@
+import json
 from alembic import context
 from sqlalchemy import engine_from_config, pool
 from dotenv import load_dotenv
@@ -6,6 +7,10 @@ import os
 # Import Base and all models
 from database.db_session import Base
 from campaigns.models.campaign import CampaignModel
+from campaigns.models.message_template import MessageTemplate
+from profiles.models.interaction_event import InteractionEvent
+from profiles.models.profile import ProfileModel
+from profiles.models.profile_alias import ProfileAlias
 
 # Load environment variables
 load_dotenv()
@@ -20,19 +25,34 @@ config.set_main_option(
     f"postgresql+psycopg2://{os.getenv('DB_USER')}:{os.getenv('DB_PASSWORD')}@{os.getenv('DB_HOST')}/{os.getenv('DB_NAME')}"
 )
 
+# Tenants with a dedicated database get the same schema (see TENANT_DATABASE_URLS in database/db_session.py)
+def tenant_database_urls():
+    urls = []
+    for tenant_config in json.loads(os.getenv("TENANT_DATABASE_URLS", "{}")).values():
+        url = tenant_config if isinstance(tenant_config, str) else tenant_config["primary"]
+        if url not in urls:
+            urls.append(url)
+    return urls
+
+def database_urls():
+    return [config.get_main_option("sqlalchemy.url")] + tenant_database_urls()
+
 # Offline migration
 def run_migrations_offline():
-    context.configure(url=config.get_main_option("sqlalchemy.url"), literal_binds=True, target_metadata=target_metadata)
-    with context.begin_transaction():
-        context.run_migrations()
+    for url in database_urls():
+        context.configure(url=url, literal_binds=True, target_metadata=target_metadata)
+        with context.begin_transaction():
+            context.run_migrations()
 
 # Online migration
 def run_migrations_online():
-    engine = engine_from_config(config.get_section(config.config_ini_section), prefix="sqlalchemy.", poolclass=pool.NullPool)
-    with engine.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
-        with context.begin_transaction():
-            context.run_migrations()
+    section = config.get_section(config.config_ini_section)
+    for url in database_urls():
+        engine = engine_from_config({**section, "sqlalchemy.url": url}, prefix="sqlalchemy.", poolclass=pool.NullPool)
+        with engine.connect() as connection:
+            context.configure(connection=connection, target_metadata=target_metadata)
+            with context.begin_transaction():
+                context.run_migrations()
 
 if context.is_offline_mode():
     run_migrations_offline()
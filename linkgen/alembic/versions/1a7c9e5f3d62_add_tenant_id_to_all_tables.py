@@ -0,0 +1,61 @@
+"""Add tenant_id to all tables with tenant-led indexes
+
+Revision ID: 1a7c9e5f3d62
+Revises: f4b81d2e6a95
+Create Date: 2025-02-27 10:47:35.281064
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '1a7c9e5f3d62'
+down_revision: Union[str, None] = 'f4b81d2e6a95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Existing rows are assigned to this tenant
+BACKFILL_TENANT_ID = 'default'
+
+TABLES = ('campaigns', 'message_templates', 'profiles', 'profile_interactions')
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(table, sa.Column('tenant_id', sa.String(), server_default=BACKFILL_TENANT_ID, nullable=False))
+        op.alter_column(table, 'tenant_id', server_default=None)
+
+    op.create_index('ix_campaigns_tenant_id_status', 'campaigns', ['tenant_id', 'status'], unique=False)
+    op.create_index('ix_campaigns_tenant_id_updated_at', 'campaigns', ['tenant_id', 'updated_at'], unique=False)
+    op.create_index('ix_message_templates_tenant_id_name', 'message_templates', ['tenant_id', 'name'], unique=False)
+    op.create_index('ix_message_templates_tenant_id_updated_at', 'message_templates', ['tenant_id', 'updated_at'], unique=False)
+
+    # A LinkedIn member can be a lead for several tenants
+    op.drop_constraint('profiles_pkey', 'profiles', type_='primary')
+    op.create_primary_key('profiles_pkey', 'profiles', ['tenant_id', 'id'])
+    op.drop_index('ix_profiles_block_key', table_name='profiles')
+    op.create_index('ix_profiles_tenant_id_block_key', 'profiles', ['tenant_id', 'block_key'], unique=False)
+
+    op.drop_index('ix_profile_interactions_profile_id_ts', table_name='profile_interactions')
+    op.create_index('ix_profile_interactions_tenant_id_profile_id_ts', 'profile_interactions', ['tenant_id', 'profile_id', 'ts'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_profile_interactions_tenant_id_profile_id_ts', table_name='profile_interactions')
+    op.create_index('ix_profile_interactions_profile_id_ts', 'profile_interactions', ['profile_id', 'ts'], unique=False)
+
+    op.drop_index('ix_profiles_tenant_id_block_key', table_name='profiles')
+    op.create_index('ix_profiles_block_key', 'profiles', ['block_key'], unique=False)
+    op.drop_constraint('profiles_pkey', 'profiles', type_='primary')
+    op.create_primary_key('profiles_pkey', 'profiles', ['id'])
+
+    op.drop_index('ix_message_templates_tenant_id_updated_at', table_name='message_templates')
+    op.drop_index('ix_message_templates_tenant_id_name', table_name='message_templates')
+    op.drop_index('ix_campaigns_tenant_id_updated_at', table_name='campaigns')
+    op.drop_index('ix_campaigns_tenant_id_status', table_name='campaigns')
+
+    for table in TABLES:
+        op.drop_column(table, 'tenant_id')
@@ -0,0 +1,29 @@
+"""Add DEFAULT partition to profile_interactions
+
+Revision ID: 3b6e0d9c4f21
+Revises: 1a7c9e5f3d62
+Create Date: 2025-03-03 09:15:44.602187
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b6e0d9c4f21'
+down_revision: Union[str, None] = '1a7c9e5f3d62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Inserts for a month without a partition land here instead of failing;
+    # profiles/retention.py moves them into a monthly partition later
+    op.execute('CREATE TABLE IF NOT EXISTS profile_interactions_default PARTITION OF profile_interactions DEFAULT')
+
+
+def downgrade() -> None:
+    op.execute('ALTER TABLE profile_interactions DETACH PARTITION profile_interactions_default')
+    op.execute('DROP TABLE profile_interactions_default')
@@ -0,0 +1,53 @@
+"""Add partitioned profile_interactions event log
+
+Revision ID: 5c3e8f1a2b47
+Revises: bd07c522f699
+Create Date: 2025-02-14 10:12:40.118204
+
+"""
+from datetime import date
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c3e8f1a2b47'
+down_revision: Union[str, None] = 'bd07c522f699'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _add_months(month, count):
+    index = month.year * 12 + (month.month - 1) + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    op.create_table('profile_interactions',
+    sa.Column('id', sa.BigInteger(), autoincrement=True, nullable=False),
+    sa.Column('ts', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('profile_id', sa.String(), nullable=False),
+    sa.Column('event_type', sa.String(), nullable=False),
+    sa.Column('detail', sa.String(), nullable=True),
+    sa.PrimaryKeyConstraint('id', 'ts'),
+    postgresql_partition_by='RANGE (ts)'
+    )
+    op.create_index('ix_profile_interactions_profile_id_ts', 'profile_interactions', ['profile_id', 'ts'], unique=False)
+
+    # Seed the current month and two ahead; profiles/retention.py keeps this rolling
+    first = date.today().replace(day=1)
+    for offset in range(3):
+        month = _add_months(first, offset)
+        op.execute(
+            f"CREATE TABLE IF NOT EXISTS profile_interactions_y{month.year:04d}m{month.month:02d} "
+            f"PARTITION OF profile_interactions "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_profile_interactions_profile_id_ts', table_name='profile_interactions')
+    # Dropping the parent drops every partition with it
+    op.drop_table('profile_interactions')
@@ -0,0 +1,40 @@
+"""Lead the search and trigram GIN indexes with tenant_id
+
+Revision ID: 5e8b1d4a7f30
+Revises: 7d2f5a8e1c94
+Create Date: 2025-03-04 14:21:57.093318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8b1d4a7f30'
+down_revision: Union[str, None] = '7d2f5a8e1c94'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_TABLES = ('campaigns', 'message_templates', 'profiles')
+
+
+def upgrade() -> None:
+    # btree_gin lets a plain column like tenant_id sit inside a GIN index
+    op.execute('CREATE EXTENSION IF NOT EXISTS btree_gin')
+    for table in SEARCH_TABLES:
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.create_index(f'ix_{table}_tenant_id_search_vector', table, ['tenant_id', 'search_vector'], unique=False, postgresql_using='gin')
+
+    op.drop_index('ix_profiles_name_key_trgm', table_name='profiles')
+    op.create_index('ix_profiles_tenant_id_name_key_trgm', 'profiles', ['tenant_id', 'name_key'], unique=False, postgresql_using='gin', postgresql_ops={'name_key': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_profiles_tenant_id_name_key_trgm', table_name='profiles')
+    op.create_index('ix_profiles_name_key_trgm', 'profiles', ['name_key'], unique=False, postgresql_using='gin', postgresql_ops={'name_key': 'gin_trgm_ops'})
+
+    for table in SEARCH_TABLES:
+        op.drop_index(f'ix_{table}_tenant_id_search_vector', table_name=table)
+        op.create_index(f'ix_{table}_search_vector', table, ['search_vector'], unique=False, postgresql_using='gin')
@@ -0,0 +1,44 @@
+"""Add profiles table with dedup match keys
+
+Revision ID: 8e4d2c6b9a10
+Revises: 5c3e8f1a2b47
+Create Date: 2025-02-17 11:03:22.540918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4d2c6b9a10'
+down_revision: Union[str, None] = '5c3e8f1a2b47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_table('profiles',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('headline', sa.String(), nullable=True),
+    sa.Column('company', sa.String(), nullable=True),
+    sa.Column('location', sa.String(), nullable=True),
+    sa.Column('connection_status', sa.String(), nullable=False),
+    sa.Column('name_key', sa.String(), nullable=False),
+    sa.Column('company_key', sa.String(), nullable=False),
+    sa.Column('block_key', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_profiles_id'), 'profiles', ['id'], unique=False)
+    op.create_index(op.f('ix_profiles_block_key'), 'profiles', ['block_key'], unique=False)
+    op.create_index('ix_profiles_name_key_trgm', 'profiles', ['name_key'], unique=False, postgresql_using='gin', postgresql_ops={'name_key': 'gin_trgm_ops'})
+
+
+def downgrade() -> None:
+    op.drop_index('ix_profiles_name_key_trgm', table_name='profiles')
+    op.drop_index(op.f('ix_profiles_block_key'), table_name='profiles')
+    op.drop_index(op.f('ix_profiles_id'), table_name='profiles')
+    op.drop_table('profiles')
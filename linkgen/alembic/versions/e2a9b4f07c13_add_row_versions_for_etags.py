@@ -0,0 +1,44 @@
+"""Add row version columns for ETags and create message_templates
+
+Revision ID: e2a9b4f07c13
+Revises: c71f0a3d5e28
+Create Date: 2025-02-21 14:26:51.903417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a9b4f07c13'
+down_revision: Union[str, None] = 'c71f0a3d5e28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('campaigns', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+    op.add_column('campaigns', sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False))
+
+    # message_templates was never part of the migration history
+    op.create_table('message_templates',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=True),
+    sa.Column('subject', sa.String(), nullable=True),
+    sa.Column('body', sa.String(), nullable=True),
+    sa.Column('version', sa.Integer(), server_default='1', nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_message_templates_id'), 'message_templates', ['id'], unique=False)
+    op.create_index(op.f('ix_message_templates_name'), 'message_templates', ['name'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_message_templates_name'), table_name='message_templates')
+    op.drop_index(op.f('ix_message_templates_id'), table_name='message_templates')
+    op.drop_table('message_templates')
+    op.drop_column('campaigns', 'updated_at')
+    op.drop_column('campaigns', 'version')
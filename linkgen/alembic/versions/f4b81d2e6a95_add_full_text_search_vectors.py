@@ -0,0 +1,50 @@
+"""Add full-text search vectors to campaigns, templates and profiles
+
+Revision ID: f4b81d2e6a95
+Revises: e2a9b4f07c13
+Create Date: 2025-02-24 16:08:12.734560
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b81d2e6a95'
+down_revision: Union[str, None] = 'e2a9b4f07c13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTORS = {
+    'campaigns': (
+        "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(description, '')), 'B')"
+    ),
+    'message_templates': (
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(subject, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(body, '')), 'C')"
+    ),
+    'profiles': (
+        "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('english', coalesce(headline, '')), 'B') || "
+        "setweight(to_tsvector('english', coalesce(company, '')), 'B')"
+    ),
+}
+
+
+def upgrade() -> None:
+    # Generated columns are recomputed by Postgres on every insert/update
+    for table, expression in SEARCH_VECTORS.items():
+        op.add_column(table, sa.Column('search_vector', postgresql.TSVECTOR(), sa.Computed(expression, persisted=True), nullable=True))
+        op.create_index(f'ix_{table}_search_vector', table, ['search_vector'], unique=False, postgresql_using='gin')
+
+
+def downgrade() -> None:
+    for table in SEARCH_VECTORS:
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.drop_column(table, 'search_vector')
@@ -0,0 +1,248 @@
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+import psutil
+from dotenv import load_dotenv
+
+from automation.fake_driver import create_fake_driver
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Pool limits (per host)
+MAX_BROWSERS = int(os.getenv("DRIVER_POOL_MAX_BROWSERS", "4"))
+# Chrome locks its profile directory, so one account normally gets one browser
+MAX_BROWSERS_PER_ACCOUNT = int(os.getenv("DRIVER_POOL_MAX_PER_ACCOUNT", "1"))
+MAX_ACTIONS_PER_SESSION = int(os.getenv("DRIVER_POOL_MAX_ACTIONS", "200"))
+MAX_SESSION_MEMORY_MB = float(os.getenv("DRIVER_POOL_MAX_MEMORY_MB", "1024"))
+CHECKOUT_TIMEOUT = float(os.getenv("DRIVER_POOL_CHECKOUT_TIMEOUT", "60"))
+CHROME_PROFILE_DIR = os.getenv("CHROME_PROFILE_DIR", "chrome_profiles")
+CHROME_HEADLESS = os.getenv("CHROME_HEADLESS", "true").lower() == "true"
+
+# Swap in FakeDriver instead of launching Chrome
+TEST_MODE = os.getenv("AUTOMATION_TEST_MODE", "false").lower() == "true"
+
+
+class PoolExhausted(Exception):
+    """Raised when no browser session frees up before the checkout timeout."""
+
+
+def create_chrome_driver(account_id):
+    """Launch Chrome with a persistent profile directory for the account."""
+    import undetected_chromedriver as uc
+
+    options = uc.ChromeOptions()
+    options.add_argument(f"--user-data-dir={os.path.abspath(os.path.join(CHROME_PROFILE_DIR, str(account_id)))}")
+    if CHROME_HEADLESS:
+        options.add_argument("--headless=new")
+    return uc.Chrome(options=options)
+
+
+def driver_memory_mb(driver):
+    """Resident memory of the browser and all its child processes in MB, or None if unknown.
+
+    Renderer and GPU processes hold most of Chrome's memory growth, so the
+    whole process tree is summed, not just the top-level pid.
+    """
+    if hasattr(driver, "memory_mb"):
+        return driver.memory_mb
+
+    pid = getattr(driver, "browser_pid", None)
+    if pid is None:
+        # chromedriver's own process; Chrome runs as its child
+        service = getattr(driver, "service", None)
+        process = getattr(service, "process", None)
+        pid = getattr(process, "pid", None)
+    if pid is None:
+        return None
+
+    try:
+        root = psutil.Process(pid)
+        processes = [root] + root.children(recursive=True)
+    except psutil.Error:
+        return None
+
+    total = 0
+    for process in processes:
+        try:
+            total += process.memory_info().rss
+        except psutil.Error:
+            # Children can exit between listing and measuring
+            continue
+    return total / (1024 * 1024)
+
+
+class DriverSession:
+    """A warm browser bound to one LinkedIn account."""
+
+    def __init__(self, account_id, driver):
+        self.account_id = account_id
+        self.driver = driver
+        self.actions = 0
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+
+    def record_action(self, count=1):
+        self.actions += count
+
+
+class DriverPool:
+    """Keeps warm browser sessions per account and leases them to tasks.
+
+    At most `max_browsers` browsers are alive at once. A session is recycled
+    after `max_actions` recorded actions or once its browser grows past
+    `max_memory_mb`. When the pool is full, an idle session of another
+    account is evicted (least recently used first) before a caller waits.
+    Callers for an account that already has `max_per_account` sessions
+    leased wait for one of them to come back.
+    """
+
+    def __init__(
+        self,
+        driver_factory=None,
+        max_browsers=MAX_BROWSERS,
+        max_per_account=MAX_BROWSERS_PER_ACCOUNT,
+        max_actions=MAX_ACTIONS_PER_SESSION,
+        max_memory_mb=MAX_SESSION_MEMORY_MB,
+        test_mode=TEST_MODE,
+    ):
+        if driver_factory is None:
+            driver_factory = create_fake_driver if test_mode else create_chrome_driver
+        self.driver_factory = driver_factory
+        self.max_browsers = max_browsers
+        self.max_per_account = max_per_account
+        self.max_actions = max_actions
+        self.max_memory_mb = max_memory_mb
+
+        self._idle = defaultdict(list)
+        self._leased = defaultdict(int)
+        self._live = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def checkout(self, account_id, timeout=CHECKOUT_TIMEOUT):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        evicted = None
+
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Driver pool is closed")
+                idle = self._idle[account_id]
+                if idle:
+                    self._leased[account_id] += 1
+                    return idle.pop()
+                if self._leased[account_id] < self.max_per_account:
+                    if self._live < self.max_browsers:
+                        self._live += 1
+                        self._leased[account_id] += 1
+                        break
+                    evicted = self._pop_least_recent_idle()
+                    if evicted is not None:
+                        # The evicted browser's slot is handed to this caller
+                        self._leased[account_id] += 1
+                        break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise PoolExhausted(f"No browser available for account {account_id}")
+                self._cond.wait(remaining)
+
+        if evicted is not None:
+            self._quit(evicted)
+
+        try:
+            driver = self.driver_factory(account_id)
+        except Exception:
+            with self._cond:
+                self._live -= 1
+                self._leased[account_id] -= 1
+                self._cond.notify_all()
+            raise
+        return DriverSession(account_id, driver)
+
+    def release(self, session, discard=False):
+        recycle = discard or self._should_recycle(session)
+
+        with self._cond:
+            self._leased[session.account_id] -= 1
+            if recycle or self._closed:
+                self._live -= 1
+            else:
+                session.last_used = time.monotonic()
+                self._idle[session.account_id].append(session)
+            # Waiters may be blocked on the global cap or on this account
+            self._cond.notify_all()
+
+        if recycle or self._closed:
+            self._quit(session)
+
+    @contextmanager
+    def lease(self, account_id, timeout=CHECKOUT_TIMEOUT):
+        session = self.checkout(account_id, timeout=timeout)
+        try:
+            yield session
+        except Exception:
+            # A failed task may leave the browser in an unknown state
+            self.release(session, discard=True)
+            raise
+        else:
+            self.release(session)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            sessions = [s for idle in self._idle.values() for s in idle]
+            self._idle.clear()
+            self._live -= len(sessions)
+            self._cond.notify_all()
+
+        for session in sessions:
+            self._quit(session)
+
+    def stats(self):
+        with self._cond:
+            idle = sum(len(sessions) for sessions in self._idle.values())
+            return {
+                "live": self._live,
+                "idle": idle,
+                "in_use": self._live - idle,
+                "max_browsers": self.max_browsers,
+            }
+
+    def _should_recycle(self, session):
+        if session.actions >= self.max_actions:
+            return True
+        memory = driver_memory_mb(session.driver)
+        return memory is not None and memory >= self.max_memory_mb
+
+    def _pop_least_recent_idle(self):
+        oldest = None
+        for sessions in self._idle.values():
+            for session in sessions:
+                if oldest is None or session.last_used < oldest.last_used:
+                    oldest = session
+        if oldest is not None:
+            self._idle[oldest.account_id].remove(oldest)
+        return oldest
+
+    @staticmethod
+    def _quit(session):
+        try:
+            session.driver.quit()
+        except Exception:
+            pass
+
+
+_driver_pool = None
+_driver_pool_lock = threading.Lock()
+
+
+# Shared pool for the automation workers in this process
+def get_driver_pool():
+    global _driver_pool
+    with _driver_pool_lock:
+        if _driver_pool is None:
+            _driver_pool = DriverPool()
+        return _driver_pool
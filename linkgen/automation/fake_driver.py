@@ -0,0 +1,39 @@
+import itertools
+import time
+
+_pids = itertools.count(10000)
+
+
+class FakeDriver:
+    """Stand-in for a Selenium WebDriver used when the pool runs in test mode.
+
+    Every navigation sleeps for `latency` seconds and grows the reported memory
+    by `memory_step_mb`, so recycling and throughput can be exercised without
+    a real browser or network.
+    """
+
+    def __init__(self, account_id, latency=0.0, base_memory_mb=150.0, memory_step_mb=2.0):
+        self.account_id = account_id
+        self.latency = latency
+        self.memory_mb = base_memory_mb
+        self.memory_step_mb = memory_step_mb
+        self.browser_pid = next(_pids)
+        self.current_url = "about:blank"
+        self.visited = []
+        self.closed = False
+
+    def get(self, url):
+        if self.closed:
+            raise RuntimeError("FakeDriver used after quit()")
+        if self.latency:
+            time.sleep(self.latency)
+        self.current_url = url
+        self.visited.append(url)
+        self.memory_mb += self.memory_step_mb
+
+    def quit(self):
+        self.closed = True
+
+
+def create_fake_driver(account_id):
+    return FakeDriver(account_id)
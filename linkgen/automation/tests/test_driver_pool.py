@@ -0,0 +1,175 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+import unittest
+
+import psutil
+
+from automation.driver_pool import DriverPool, PoolExhausted, driver_memory_mb
+from automation.fake_driver import FakeDriver
+
+
+class DriverPoolTests(unittest.TestCase):
+    def make_pool(self, **kwargs):
+        pool = DriverPool(test_mode=True, **kwargs)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_reuses_warm_session_for_same_account(self):
+        pool = self.make_pool(max_browsers=2)
+
+        with pool.lease("alice") as first:
+            first.driver.get("https://www.linkedin.com/feed/")
+        with pool.lease("alice") as second:
+            pass
+
+        self.assertIs(first.driver, second.driver)
+        self.assertFalse(second.driver.closed)
+        self.assertEqual(pool.stats()["live"], 1)
+
+    def test_recycles_after_max_actions(self):
+        pool = self.make_pool(max_actions=2)
+
+        with pool.lease("alice") as session:
+            session.record_action(2)
+        with pool.lease("alice") as replacement:
+            pass
+
+        self.assertTrue(session.driver.closed)
+        self.assertIsNot(session.driver, replacement.driver)
+
+    def test_recycles_on_memory_growth(self):
+        pool = self.make_pool(max_memory_mb=200)
+
+        with pool.lease("alice") as session:
+            session.driver.memory_mb = 250
+        with pool.lease("alice") as replacement:
+            pass
+
+        self.assertTrue(session.driver.closed)
+        self.assertIsNot(session.driver, replacement.driver)
+
+    def test_failed_task_discards_session(self):
+        pool = self.make_pool()
+
+        with self.assertRaises(ValueError):
+            with pool.lease("alice") as session:
+                raise ValueError("page crashed")
+
+        self.assertTrue(session.driver.closed)
+        self.assertEqual(pool.stats()["live"], 0)
+
+    def test_full_pool_evicts_idle_session_of_other_account(self):
+        pool = self.make_pool(max_browsers=1)
+
+        with pool.lease("alice") as alice:
+            pass
+        with pool.lease("bob") as bob:
+            pass
+
+        self.assertTrue(alice.driver.closed)
+        self.assertFalse(bob.driver.closed)
+        self.assertEqual(pool.stats()["live"], 1)
+
+    def test_checkout_times_out_when_all_browsers_are_in_use(self):
+        pool = self.make_pool(max_browsers=1)
+        held = pool.checkout("alice")
+
+        started = time.monotonic()
+        with self.assertRaises(PoolExhausted):
+            pool.checkout("bob", timeout=0.05)
+        self.assertGreaterEqual(time.monotonic() - started, 0.05)
+
+        pool.release(held)
+        pool.release(pool.checkout("bob", timeout=0.05))
+
+    def test_second_lease_for_same_account_waits(self):
+        pool = self.make_pool(max_browsers=4)
+        held = pool.checkout("alice")
+
+        with self.assertRaises(PoolExhausted):
+            pool.checkout("alice", timeout=0.05)
+
+        pool.release(held)
+        self.assertIs(pool.checkout("alice", timeout=0.05).driver, held.driver)
+
+    def test_waiting_checkout_gets_released_browser(self):
+        pool = self.make_pool(max_browsers=1)
+        held = pool.checkout("alice")
+        threading.Timer(0.02, pool.release, args=(held,)).start()
+
+        session = pool.checkout("bob", timeout=1)
+
+        self.assertEqual(session.account_id, "bob")
+        self.assertTrue(held.driver.closed)
+        pool.release(session)
+
+    def test_concurrent_leases_respect_cap_and_reuse_browsers(self):
+        max_browsers = 3
+        created = []
+        alive = {"now": 0, "peak": 0}
+        lock = threading.Lock()
+
+        class CountingDriver(FakeDriver):
+            def quit(self):
+                with lock:
+                    alive["now"] -= 1
+                super().quit()
+
+        def factory(account_id):
+            with lock:
+                alive["now"] += 1
+                alive["peak"] = max(alive["peak"], alive["now"])
+            driver = CountingDriver(account_id, latency=0.001)
+            created.append(driver)
+            return driver
+
+        pool = self.make_pool(driver_factory=factory, max_browsers=max_browsers)
+        workers, leases_per_worker = 8, 25
+
+        def work(index):
+            account = f"account-{index % max_browsers}"
+            for _ in range(leases_per_worker):
+                with pool.lease(account, timeout=5) as session:
+                    session.driver.get("https://www.linkedin.com/feed/")
+                    session.record_action()
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(workers)]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - started
+
+        total = workers * leases_per_worker
+        self.assertEqual(sum(len(driver.visited) for driver in created), total)
+        self.assertLessEqual(alive["peak"], max_browsers)
+        # Warm sessions are reused rather than relaunched per action
+        self.assertLessEqual(len(created), max_browsers)
+        # 200 leases over 3 browsers at 1 ms each should finish well inside this
+        self.assertLess(elapsed, 2.0)
+
+
+class DriverMemoryTests(unittest.TestCase):
+    def test_sums_resident_memory_of_child_processes(self):
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(10)"])
+        self.addCleanup(child.kill)
+        # Give the child time to start the interpreter
+        time.sleep(0.2)
+
+        class Driver:
+            browser_pid = os.getpid()
+
+        own_mb = psutil.Process().memory_info().rss / (1024 * 1024)
+        child_mb = psutil.Process(child.pid).memory_info().rss / (1024 * 1024)
+
+        self.assertGreaterEqual(driver_memory_mb(Driver()), own_mb + child_mb * 0.9)
+
+    def test_unknown_process_reports_none(self):
+        class Driver:
+            browser_pid = None
+
+        self.assertIsNone(driver_memory_mb(Driver()))
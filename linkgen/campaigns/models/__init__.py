@@ -1 +1,2 @@
-from .campaign import CampaignModel
\ No newline at end of file
+from .campaign import CampaignModel
+from .message_template import MessageTemplate
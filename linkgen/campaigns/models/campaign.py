@@ -1,8 +1,19 @@
-from sqlalchemy import Column, Integer, String, Boolean, Date
+from sqlalchemy import Column, Computed, Integer, String, Boolean, Date, DateTime, Index, func, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from database.db_session import Base
+from database.tenancy import TenantScoped
 
-class CampaignModel(Base):
+class CampaignModel(TenantScoped, Base):
     __tablename__ = "campaigns"
+    __table_args__ = (
+        # Used by campaigns/scheduler.py to load pending status transitions
+        Index("ix_campaigns_status_start_date", "status", "start_date"),
+        Index("ix_campaigns_status_end_date", "status", "end_date"),
+        # Per-tenant search, list/count and revalidation queries (tenant_id in GIN needs btree_gin)
+        Index("ix_campaigns_tenant_id_search_vector", "tenant_id", "search_vector", postgresql_using="gin"),
+        Index("ix_campaigns_tenant_id_status", "tenant_id", "status"),
+        Index("ix_campaigns_tenant_id_updated_at", "tenant_id", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True, nullable=False)
@@ -10,4 +21,19 @@ class CampaignModel(Base):
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
     status = Column(String, nullable=False, default="scheduled")  # Example default status
-    active = Column(Boolean, default=True, nullable=False)
\ No newline at end of file
+    active = Column(Boolean, default=True, nullable=False)
+
+    # Row version for ETags; the SQL-side onupdate also covers the scheduler's Core updates
+    version = Column(Integer, nullable=False, default=1, server_default="1", onupdate=text("version + 1"))
+    # clock_timestamp(): a transaction that started earlier must not stamp an older time
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.clock_timestamp())
+
+    # Full-text search document, maintained by Postgres on every write
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+    )
@@ -1,10 +1,33 @@
-from sqlalchemy import Column, Integer, String
-from database import Base
+from sqlalchemy import Column, Computed, DateTime, Index, Integer, String, func, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from database.db_session import Base
+from database.tenancy import TenantScoped
 
-class MessageTemplate(Base):
+class MessageTemplate(TenantScoped, Base):
     __tablename__ = "message_templates"
+    __table_args__ = (
+        # tenant_id in a GIN index needs the btree_gin extension
+        Index("ix_message_templates_tenant_id_search_vector", "tenant_id", "search_vector", postgresql_using="gin"),
+        Index("ix_message_templates_tenant_id_name", "tenant_id", "name"),
+        Index("ix_message_templates_tenant_id_updated_at", "tenant_id", "updated_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, index=True)
     subject = Column(String)
     body = Column(String)
+
+    # Used to build ETag/Last-Modified (fastapi_app/http_cache.py)
+    version = Column(Integer, nullable=False, default=1, server_default="1", onupdate=text("version + 1"))
+    # clock_timestamp(), not the transaction start time (see CampaignModel)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now(), onupdate=func.clock_timestamp())
+
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(subject, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(body, '')), 'C')",
+            persisted=True,
+        ),
+    )
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from campaigns.models.campaign import CampaignModel
@@ -7,7 +8,15 @@ from campaigns.schemas.campaign import (
     CampaignCreate,
     CampaignUpdate,
 )
+from campaigns.scheduler import notify_campaign_changed
 from database.db_session import get_db
+from fastapi_app.http_cache import (
+    cache_headers,
+    is_conditional,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+)
 
 campaign_router = APIRouter()
 
@@ -17,6 +26,8 @@ campaign_router = APIRouter()
 def create_campaign(campaign: CampaignCreate, db: Session = Depends(get_db)):
     db_campaign = CampaignModel(**campaign.model_dump())  # Fixed dict() usage
     db.add(db_campaign)
+    db.flush()
+    notify_campaign_changed(db, db_campaign.id)
     db.commit()
     db.refresh(db_campaign)
     return db_campaign
@@ -25,6 +36,8 @@ def create_campaign(campaign: CampaignCreate, db: Session = Depends(get_db)):
 # Get all campaigns with filtering and pagination
 @campaign_router.get("/", response_model=dict)
 def get_campaigns(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     page: int = Query(1, alias="page", ge=1),
     per_page: int = Query(10, alias="per_page", ge=1, le=100),
@@ -35,9 +48,19 @@ def get_campaigns(
     if status:
         query = query.filter(CampaignModel.status == status)
 
-    total = query.count()
+    # Every write bumps a row's version, so the version sum changes even when a
+    # transaction commits out of order with an older updated_at. For that reason
+    # the list sends no Last-Modified.
+    total, versions, last_modified = query.with_entities(
+        func.count(CampaignModel.id), func.sum(CampaignModel.version), func.max(CampaignModel.updated_at)
+    ).one()
+    etag = make_etag("campaigns", status, page, per_page, total, versions, last_modified)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
     campaigns = query.offset((page - 1) * per_page).limit(per_page).all()
 
+    response.headers.update(cache_headers(etag))
     return {
         "data": [CampaignSchema.model_validate(c) for c in campaigns],
         "total": total,
@@ -48,12 +71,30 @@ def get_campaigns(
 
 # Get a specific campaign by ID
 @campaign_router.get("/{campaign_id}", response_model=CampaignSchema)
-def get_campaign_by_id(campaign_id: int, db: Session = Depends(get_db)):
+def get_campaign_by_id(
+    campaign_id: int, request: Request, response: Response, db: Session = Depends(get_db)
+):
+    # Revalidation only needs the version columns, not the full row
+    if is_conditional(request):
+        row_version = (
+            db.query(CampaignModel.version, CampaignModel.updated_at)
+            .filter(CampaignModel.id == campaign_id)
+            .first()
+        )
+        if row_version is None:
+            raise HTTPException(status_code=404, detail="Campaign not found")
+        etag = make_etag("campaign", campaign_id, row_version.version)
+        if is_not_modified(request, etag, row_version.updated_at):
+            return not_modified_response(etag, row_version.updated_at)
+
     db_campaign = (
         db.query(CampaignModel).filter(CampaignModel.id == campaign_id).first()
     )
     if db_campaign is None:
         raise HTTPException(status_code=404, detail="Campaign not found")
+    response.headers.update(
+        cache_headers(make_etag("campaign", campaign_id, db_campaign.version), db_campaign.updated_at)
+    )
     return db_campaign
 
 
@@ -72,6 +113,7 @@ def update_campaign(
     for key, value in campaign_data.items():
         setattr(db_campaign, key, value)
 
+    notify_campaign_changed(db, campaign_id)
     db.commit()
     db.refresh(db_campaign)
     return db_campaign
@@ -87,5 +129,6 @@ def delete_campaign(campaign_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Campaign not found")
 
     db.delete(db_campaign)
+    notify_campaign_changed(db, campaign_id)
     db.commit()
     return {"success": True}
@@ -1,9 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from typing import List
 from campaigns import models
 from campaigns.schemas.message_template import MessageTemplate, MessageTemplateCreate, MessageTemplateUpdate
 from database.db_session import get_db
+from fastapi_app.http_cache import (
+    cache_headers,
+    is_conditional,
+    is_not_modified,
+    make_etag,
+    not_modified_response,
+)
 
 message_template_router = APIRouter()
 
@@ -23,15 +31,38 @@ def create_message_template(
 
 # Get all message templates
 @message_template_router.get("/", response_model=List[MessageTemplate])
-def get_message_templates(db: Session = db_dependency):
+def get_message_templates(request: Request, response: Response, db: Session = db_dependency):
+    # Version sum catches writes committed out of order (see campaigns list)
+    total, versions, last_modified = db.query(
+        func.count(models.MessageTemplate.id),
+        func.sum(models.MessageTemplate.version),
+        func.max(models.MessageTemplate.updated_at),
+    ).one()
+    etag = make_etag("message_templates", total, versions, last_modified)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
     message_templates = db.query(models.MessageTemplate).all()
+    response.headers.update(cache_headers(etag))
     return message_templates
 
 # Get a specific message template by ID
 @message_template_router.get("/{message_template_id}", response_model=MessageTemplate)
 def get_message_template_by_id(
-    message_template_id: int, db: Session = db_dependency
+    message_template_id: int, request: Request, response: Response, db: Session = db_dependency
 ):
+    if is_conditional(request):
+        row_version = (
+            db.query(models.MessageTemplate.version, models.MessageTemplate.updated_at)
+            .filter(models.MessageTemplate.id == message_template_id)
+            .first()
+        )
+        if row_version is None:
+            raise HTTPException(status_code=404, detail="Message Template not found")
+        etag = make_etag("message_template", message_template_id, row_version.version)
+        if is_not_modified(request, etag, row_version.updated_at):
+            return not_modified_response(etag, row_version.updated_at)
+
     db_message_template = (
         db.query(models.MessageTemplate)
         .filter(models.MessageTemplate.id == message_template_id)
@@ -39,6 +70,12 @@ def get_message_template_by_id(
     )
     if db_message_template is None:
         raise HTTPException(status_code=404, detail="Message Template not found")
+    response.headers.update(
+        cache_headers(
+            make_etag("message_template", message_template_id, db_message_template.version),
+            db_message_template.updated_at,
+        )
+    )
     return db_message_template
 
 # Update a message template
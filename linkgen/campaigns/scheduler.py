@@ -0,0 +1,204 @@
+import argparse
+import heapq
+import logging
+import os
+import select
+import time
+from datetime import date, datetime, timedelta
+from sqlalchemy import select as sql_select, text, update
+from campaigns.models.campaign import CampaignModel
+from database.db_session import engine, get_engine
+
+logger = logging.getLogger(__name__)
+
+# Advisory lock key shared by every scheduler instance; only the holder fires transitions
+SCHEDULER_LOCK_KEY = int(os.getenv("CAMPAIGN_SCHEDULER_LOCK_KEY", "731100"))
+# Upper bound on how long the leader sleeps without re-checking the heap
+MAX_SLEEP_SECONDS = float(os.getenv("CAMPAIGN_SCHEDULER_MAX_SLEEP", "60"))
+# How often a follower retries to become leader
+FOLLOWER_RETRY_SECONDS = float(os.getenv("CAMPAIGN_SCHEDULER_RETRY", "15"))
+
+# Postgres NOTIFY channel the campaign routes publish changed ids on
+CHANGE_CHANNEL = "campaign_schedule"
+
+
+def next_transition(status, start_date, end_date):
+    """Return (due_date, from_status, to_status) for the campaign's next automatic transition."""
+    if status == "scheduled":
+        return start_date, "scheduled", "active"
+    if status == "active":
+        # A campaign runs through its end date and completes the day after
+        return end_date + timedelta(days=1), "active", "completed"
+    return None
+
+
+def _is_due(from_status, today):
+    """SQL condition matching next_transition, so a stale heap entry cannot fire early."""
+    if from_status == "scheduled":
+        return CampaignModel.start_date <= today
+    return CampaignModel.end_date < today
+
+
+def notify_campaign_changed(db, campaign_id):
+    """Tell the scheduler leader to re-read a campaign; delivered when `db` commits."""
+    db.execute(
+        text("SELECT pg_notify(:channel, :payload)"),
+        {"channel": CHANGE_CHANNEL, "payload": str(campaign_id)},
+    )
+
+
+def _select_schedule(conn, criterion):
+    return conn.execute(
+        sql_select(CampaignModel.id, CampaignModel.status, CampaignModel.start_date, CampaignModel.end_date)
+        .where(criterion)
+    )
+
+
+class CampaignScheduler:
+    """Min-heap of next-due campaign transitions, fired by a single leader.
+
+    Rather than scanning the campaigns table on a timer, the leader loads the
+    pending transitions once, then only re-reads campaigns whose ids arrive
+    on the change channel. Heap entries are invalidated lazily: an entry is
+    only acted on if it is still the campaign's entry in `_pending`, dates
+    included, so an edited end date cannot fire from the old one.
+    """
+
+    def __init__(self, engine=engine, clock=date.today):
+        self.engine = engine
+        self.clock = clock
+        self._heap = []
+        self._pending = {}
+
+    @staticmethod
+    def _entry(campaign_id, status, start_date, end_date):
+        event = next_transition(status, start_date, end_date)
+        if event is None:
+            return None
+        due, from_status, to_status = event
+        return due, campaign_id, from_status, to_status, start_date, end_date
+
+    def schedule(self, campaign_id, status, start_date, end_date):
+        entry = self._entry(campaign_id, status, start_date, end_date)
+        if entry is None:
+            self._pending.pop(campaign_id, None)
+            return
+        self._pending[campaign_id] = entry
+        heapq.heappush(self._heap, entry)
+
+    def load(self, conn):
+        rows = _select_schedule(conn, CampaignModel.status.in_(("scheduled", "active")))
+        self._heap = []
+        self._pending = {}
+        for row in rows:
+            entry = self._entry(row.id, row.status, row.start_date, row.end_date)
+            if entry is None:
+                continue
+            self._pending[row.id] = entry
+            self._heap.append(entry)
+        heapq.heapify(self._heap)
+
+    def refresh(self, conn, campaign_ids):
+        """Re-read only the given campaigns; deleted ones are dropped from the schedule."""
+        rows = _select_schedule(conn, CampaignModel.id.in_(campaign_ids))
+        seen = set()
+        for row in rows:
+            seen.add(row.id)
+            self.schedule(row.id, row.status, row.start_date, row.end_date)
+        for campaign_id in set(campaign_ids) - seen:
+            self._pending.pop(campaign_id, None)
+
+    def next_due(self):
+        while self._heap:
+            entry = self._heap[0]
+            if self._pending.get(entry[1]) == entry:
+                return entry[0]
+            heapq.heappop(self._heap)
+        return None
+
+    def fire_due(self, conn, today=None):
+        """Apply every transition due on or before `today`; returns [(campaign_id, to_status)]."""
+        today = today or self.clock()
+        fired = []
+        while True:
+            due = self.next_due()
+            if due is None or due > today:
+                return fired
+            _, campaign_id, from_status, to_status, _, _ = heapq.heappop(self._heap)
+            self._pending.pop(campaign_id, None)
+
+            # Guarded on the old status and the stored dates so a concurrent edit wins;
+            # its notification reschedules the campaign
+            row = conn.execute(
+                update(CampaignModel)
+                .where(
+                    CampaignModel.id == campaign_id,
+                    CampaignModel.status == from_status,
+                    _is_due(from_status, today),
+                )
+                .values(status=to_status)
+                .returning(CampaignModel.start_date, CampaignModel.end_date)
+            ).first()
+            if row is not None:
+                fired.append((campaign_id, to_status))
+                self.schedule(campaign_id, to_status, row.start_date, row.end_date)
+
+    def seconds_until_next_due(self):
+        due = self.next_due()
+        if due is None:
+            return MAX_SLEEP_SECONDS
+        wake_at = datetime.combine(due, datetime.min.time())
+        return max(0.0, min(MAX_SLEEP_SECONDS, (wake_at - datetime.now()).total_seconds()))
+
+    def run(self):
+        """Block forever, competing for leadership and firing transitions while leader."""
+        while True:
+            raw = self.engine.raw_connection()
+            # Detached so close() really ends the session and releases the advisory lock
+            raw.detach()
+            try:
+                listen_conn = raw.driver_connection
+                listen_conn.autocommit = True
+                with listen_conn.cursor() as cursor:
+                    cursor.execute("SELECT pg_try_advisory_lock(%s)", (SCHEDULER_LOCK_KEY,))
+                    is_leader = cursor.fetchone()[0]
+                if is_leader:
+                    logger.info("Campaign scheduler acquired leadership")
+                    self._lead(listen_conn)
+            except Exception:
+                logger.exception("Campaign scheduler lost its connection; retrying")
+            finally:
+                raw.close()
+            time.sleep(FOLLOWER_RETRY_SECONDS)
+
+    def _lead(self, listen_conn):
+        with listen_conn.cursor() as cursor:
+            cursor.execute(f"LISTEN {CHANGE_CHANNEL}")
+
+        with self.engine.begin() as conn:
+            self.load(conn)
+
+        while True:
+            with self.engine.begin() as conn:
+                for campaign_id, status in self.fire_due(conn):
+                    logger.info("Campaign %s moved to %s", campaign_id, status)
+
+            ready, _, _ = select.select([listen_conn], [], [], self.seconds_until_next_due())
+            if not ready:
+                continue
+            listen_conn.poll()
+            changed = {int(n.payload) for n in listen_conn.notifies if n.payload.isdigit()}
+            del listen_conn.notifies[:]
+            if changed:
+                with self.engine.begin() as conn:
+                    self.refresh(conn, changed)
+
+
+if __name__ == "__main__":
+    # One scheduler per database; tenants with a dedicated database need their own
+    parser = argparse.ArgumentParser(description="Fire automatic campaign status transitions")
+    parser.add_argument("--tenant", help="run against this tenant's dedicated database")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    CampaignScheduler(engine=get_engine(args.tenant)).run()
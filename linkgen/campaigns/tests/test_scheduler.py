@@ -0,0 +1,129 @@
+import os
+import unittest
+from datetime import date, datetime
+
+# database.db_session reads its settings at import time
+os.environ.setdefault("DB_PASSWORD", "")
+
+from sqlalchemy import (
+    Boolean, Column, Date, DateTime, Integer, MetaData, String, Table, create_engine, delete, event, insert, select,
+    update,
+)
+
+from campaigns.scheduler import CampaignScheduler, next_transition
+
+# The columns the scheduler reads and writes; the real table's tsvector column is Postgres-only
+metadata = MetaData()
+campaigns = Table(
+    "campaigns",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("tenant_id", String, nullable=False, default="acme"),
+    Column("title", String, nullable=False, default="Campaign"),
+    Column("description", String, nullable=False, default=""),
+    Column("start_date", Date, nullable=False),
+    Column("end_date", Date, nullable=False),
+    Column("status", String, nullable=False),
+    Column("active", Boolean, nullable=False, default=True),
+    Column("version", Integer, nullable=False, default=1),
+    Column("updated_at", DateTime),
+)
+
+
+class NextTransitionTests(unittest.TestCase):
+    def test_scheduled_campaign_activates_on_start_date(self):
+        self.assertEqual(
+            next_transition("scheduled", date(2025, 3, 1), date(2025, 3, 10)),
+            (date(2025, 3, 1), "scheduled", "active"),
+        )
+
+    def test_active_campaign_completes_the_day_after_its_end_date(self):
+        self.assertEqual(
+            next_transition("active", date(2025, 3, 1), date(2025, 3, 31)),
+            (date(2025, 4, 1), "active", "completed"),
+        )
+
+    def test_other_statuses_have_no_transition(self):
+        self.assertIsNone(next_transition("completed", date(2025, 3, 1), date(2025, 3, 10)))
+        self.assertIsNone(next_transition("paused", date(2025, 3, 1), date(2025, 3, 10)))
+
+
+class CampaignSchedulerTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        # Postgres function used by the models' updated_at onupdate
+        event.listen(
+            self.engine,
+            "connect",
+            lambda dbapi_conn, _: dbapi_conn.create_function("clock_timestamp", 0, lambda: datetime.now().isoformat()),
+        )
+        metadata.create_all(self.engine)
+        self.conn = self.engine.connect()
+        self.addCleanup(self.conn.close)
+        self.scheduler = CampaignScheduler(engine=self.engine)
+
+    def add(self, campaign_id, status, start_date, end_date):
+        self.conn.execute(
+            insert(campaigns).values(id=campaign_id, status=status, start_date=start_date, end_date=end_date)
+        )
+
+    def edit(self, campaign_id, **values):
+        self.conn.execute(update(campaigns).where(campaigns.c.id == campaign_id).values(**values))
+
+    def status(self, campaign_id):
+        return self.conn.execute(select(campaigns.c.status).where(campaigns.c.id == campaign_id)).scalar_one()
+
+    def test_fires_transitions_in_due_order(self):
+        self.add(1, "scheduled", date(2025, 3, 1), date(2025, 3, 10))
+        self.add(2, "active", date(2025, 2, 1), date(2025, 2, 27))
+        self.add(3, "completed", date(2025, 1, 1), date(2025, 1, 31))
+        self.scheduler.load(self.conn)
+
+        self.assertEqual(self.scheduler.next_due(), date(2025, 2, 28))
+        self.assertEqual(self.scheduler.fire_due(self.conn, today=date(2025, 2, 27)), [])
+        self.assertEqual(
+            self.scheduler.fire_due(self.conn, today=date(2025, 3, 1)), [(2, "completed"), (1, "active")]
+        )
+        self.assertEqual(self.status(1), "active")
+        self.assertEqual(self.status(2), "completed")
+        # The activated campaign is rescheduled for completion
+        self.assertEqual(self.scheduler.next_due(), date(2025, 3, 11))
+
+    def test_extended_end_date_does_not_complete_early(self):
+        self.add(1, "scheduled", date(2025, 3, 1), date(2025, 3, 10))
+        self.scheduler.load(self.conn)
+        self.edit(1, end_date=date(2025, 3, 31))
+        self.scheduler.refresh(self.conn, [1])
+
+        self.assertEqual(self.scheduler.fire_due(self.conn, today=date(2025, 3, 11)), [(1, "active")])
+        self.assertEqual(self.status(1), "active")
+        self.assertEqual(self.scheduler.next_due(), date(2025, 4, 1))
+
+    def test_unnotified_date_change_is_not_overwritten(self):
+        self.add(1, "active", date(2025, 3, 1), date(2025, 3, 10))
+        self.scheduler.load(self.conn)
+        # Edited without a notification reaching the scheduler
+        self.edit(1, end_date=date(2025, 3, 31))
+
+        self.assertEqual(self.scheduler.fire_due(self.conn, today=date(2025, 3, 11)), [])
+        self.assertEqual(self.status(1), "active")
+
+    def test_manual_status_change_wins(self):
+        self.add(1, "scheduled", date(2025, 3, 1), date(2025, 3, 10))
+        self.scheduler.load(self.conn)
+        self.edit(1, status="paused")
+
+        self.assertEqual(self.scheduler.fire_due(self.conn, today=date(2025, 3, 1)), [])
+        self.assertEqual(self.status(1), "paused")
+
+    def test_refresh_reschedules_changed_and_drops_deleted_campaigns(self):
+        self.add(1, "scheduled", date(2025, 3, 1), date(2025, 3, 10))
+        self.add(2, "scheduled", date(2025, 3, 5), date(2025, 3, 10))
+        self.scheduler.load(self.conn)
+
+        self.edit(1, start_date=date(2025, 3, 7))
+        self.conn.execute(delete(campaigns).where(campaigns.c.id == 2))
+        self.scheduler.refresh(self.conn, [1, 2])
+
+        self.assertEqual(self.scheduler.next_due(), date(2025, 3, 7))
+        self.assertEqual(self.scheduler.fire_due(self.conn, today=date(2025, 3, 7)), [(1, "active")])
@@ -1,8 +1,14 @@
+import hmac
+import itertools
+import json
 import os
+import threading
+import time
 import urllib.parse
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from fastapi import Depends, Header, HTTPException, Request, Response
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 
 # Load environment variables from .env file
@@ -20,16 +26,207 @@ encoded_password = urllib.parse.quote(DB_PASSWORD, safe="")
 # Construct database URL
 DATABASE_URL = f"postgresql+psycopg2://{DB_USER}:{encoded_password}@{DB_HOST}/{DB_NAME}"
 
+# Read replicas of the shared database, comma-separated URLs
+REPLICA_DATABASE_URLS = [url.strip() for url in os.getenv("REPLICA_DATABASE_URLS", "").split(",") if url.strip()]
+# Tenants served from their own database: either a URL or {"primary": url, "replicas": [urls]}
+TENANT_DATABASE_URLS = json.loads(os.getenv("TENANT_DATABASE_URLS", "{}"))
+# Tenant used when the gateway sends no X-Tenant-ID header (unset: header required)
+DEFAULT_TENANT_ID = os.getenv("DEFAULT_TENANT_ID")
+# Shared with the API gateway, which sends it as X-Tenant-Gateway-Token on every request
+# it authenticated (unset: every request is rejected)
+TENANT_GATEWAY_SECRET = os.getenv("TENANT_GATEWAY_SECRET")
+
+# Replicas lagging more than this are skipped until they catch up
+MAX_REPLICA_LAG_SECONDS = float(os.getenv("MAX_REPLICA_LAG_SECONDS", "5"))
+# How long a measured replica lag is reused before it is checked again
+REPLICA_LAG_CHECK_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "2"))
+# After a write, the client's reads stay on the primary for this long
+READ_YOUR_WRITES_SECONDS = int(os.getenv("READ_YOUR_WRITES_SECONDS", "10"))
+READ_YOUR_WRITES_COOKIE = "db_primary_until"
+
+READ_METHODS = ("GET", "HEAD")
+
+# Seconds the replica is behind; 0 when it has replayed everything it received.
+# NULL (unhealthy) when it is not streaming from the primary: a replica whose WAL
+# receiver disconnected has replayed all it received but is falling behind.
+# Reading pg_stat_wal_receiver.status needs pg_read_all_stats (or pg_monitor).
+REPLICA_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming') THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+    """
+)
+
+
+def create_reader_engine(url):
+    # Fail fast so a dead replica is marked unhealthy instead of stalling requests
+    return create_engine(url, pool_pre_ping=True, connect_args={"connect_timeout": 3})
+
+
+class EnginePair:
+    """Writer engine plus optional read replica engines with lag-aware selection."""
+
+    def __init__(self, writer, readers=()):
+        self.writer = writer
+        self.readers = list(readers)
+        # reader -> (checked_at, healthy)
+        self._health = {reader: (0.0, True) for reader in self.readers}
+        self._lock = threading.Lock()
+        self._turn = itertools.count()
+
+    def reader(self):
+        """A replica within MAX_REPLICA_LAG_SECONDS, round-robin, else the writer."""
+        healthy = [reader for reader in self.readers if self._is_healthy(reader)]
+        if not healthy:
+            return self.writer
+        return healthy[next(self._turn) % len(healthy)]
+
+    def _is_healthy(self, reader):
+        now = time.monotonic()
+        with self._lock:
+            checked_at, healthy = self._health[reader]
+            if now - checked_at < REPLICA_LAG_CHECK_SECONDS:
+                return healthy
+            # Claim the check so concurrent requests keep using the last result
+            self._health[reader] = (now, healthy)
+
+        try:
+            with reader.connect() as conn:
+                lag = conn.execute(REPLICA_LAG_SQL).scalar()
+            healthy = lag is not None and lag <= MAX_REPLICA_LAG_SECONDS
+        except Exception:
+            healthy = False
+
+        with self._lock:
+            self._health[reader] = (time.monotonic(), healthy)
+        return healthy
+
+
 # Create engine and session
 engine = create_engine(DATABASE_URL, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+primary_pair = EnginePair(engine, [create_reader_engine(url) for url in REPLICA_DATABASE_URLS])
+
+
+class TenantSession(Session):
+    """Session whose ORM queries are scoped to `info["tenant_id"]` (see database/tenancy.py)."""
+
+
+SessionLocal = sessionmaker(class_=TenantSession, autocommit=False, autoflush=False, bind=engine)
+
+
+@event.listens_for(TenantSession, "before_flush")
+def _reject_replica_writes(session, flush_context, instances):
+    if session.info.get("read_only") and (session.new or session.dirty or session.deleted):
+        raise RuntimeError("Write attempted on a read-replica session; use get_write_db")
+
 
 # Base class for models
 Base = declarative_base()
 
-# Dependency to get the DB session
-def get_db():
-    db = SessionLocal()
+_tenant_pairs = {}
+_tenant_pairs_lock = threading.Lock()
+
+
+def get_engine_pair(tenant_id=None):
+    """Writer/reader engines for the tenant's dedicated database, or the shared ones."""
+    config = TENANT_DATABASE_URLS.get(tenant_id)
+    if config is None:
+        return primary_pair
+    if isinstance(config, str):
+        config = {"primary": config}
+    with _tenant_pairs_lock:
+        if tenant_id not in _tenant_pairs:
+            writer = create_engine(config["primary"], pool_pre_ping=True)
+            readers = [create_reader_engine(url) for url in config.get("replicas", ())]
+            _tenant_pairs[tenant_id] = EnginePair(writer, readers)
+        return _tenant_pairs[tenant_id]
+
+
+def get_engine(tenant_id=None):
+    """Writer engine for the tenant's dedicated database, or the shared engine."""
+    return get_engine_pair(tenant_id).writer
+
+
+def all_engines():
+    """The shared engine plus one per dedicated tenant database, for maintenance jobs."""
+    engines = [engine]
+    for tenant_id in TENANT_DATABASE_URLS:
+        tenant_engine = get_engine(tenant_id)
+        if tenant_engine not in engines:
+            engines.append(tenant_engine)
+    return engines
+
+
+def resolve_tenant_id(x_tenant_id=None, gateway_token=None):
+    """Tenant for a request that came through the gateway (X-Tenant-ID, else DEFAULT_TENANT_ID).
+
+    Clients can send any header, so the tenant must be set by the gateway
+    that authenticated them. Requests without the gateway's token are
+    rejected even without X-Tenant-ID, or dropping the header would open
+    the default tenant's data to anyone who reaches the app directly.
+    """
+    if not TENANT_GATEWAY_SECRET or not hmac.compare_digest(
+        (gateway_token or "").encode(), TENANT_GATEWAY_SECRET.encode()
+    ):
+        raise HTTPException(status_code=403, detail="Request did not come through the trusted gateway")
+    tenant_id = x_tenant_id or DEFAULT_TENANT_ID
+    if not tenant_id:
+        raise HTTPException(status_code=400, detail="X-Tenant-ID header is required")
+    return tenant_id
+
+
+# Dependency to resolve the tenant of the current request
+def get_tenant_id(x_tenant_id: str = Header(None), x_tenant_gateway_token: str = Header(None)):
+    return resolve_tenant_id(x_tenant_id, x_tenant_gateway_token)
+
+
+def _session(tenant_id, bind, read_only=False):
+    return SessionLocal(bind=bind, info={"tenant_id": tenant_id, "read_only": read_only})
+
+
+# Dependency to get a primary (writer) DB session
+def get_write_db(tenant_id: str = Depends(get_tenant_id)):
+    db = _session(tenant_id, get_engine_pair(tenant_id).writer)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+# Dependency to get the DB session, routed by request method
+def get_db(request: Request, response: Response, tenant_id: str = Depends(get_tenant_id)):
+    """GET/HEAD go to a healthy replica; everything else goes to the primary.
+
+    A write sets a short-lived cookie, and while it is valid that client's
+    reads stay on the primary so they see their own changes despite lag.
+    """
+    pair = get_engine_pair(tenant_id)
+    now = int(time.time())
+
+    if request.method in READ_METHODS:
+        try:
+            primary_until = int(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0))
+        except ValueError:
+            primary_until = 0
+        if primary_until > now:
+            db = _session(tenant_id, pair.writer)
+        else:
+            reader = pair.reader()
+            db = _session(tenant_id, reader, read_only=reader is not pair.writer)
+    else:
+        response.set_cookie(
+            READ_YOUR_WRITES_COOKIE,
+            str(now + READ_YOUR_WRITES_SECONDS),
+            max_age=READ_YOUR_WRITES_SECONDS,
+            httponly=True,
+            samesite="lax",
+        )
+        db = _session(tenant_id, pair.writer)
+
     try:
         yield db
     finally:
@@ -0,0 +1,50 @@
+from sqlalchemy import Column, String, event
+from sqlalchemy.orm import with_loader_criteria
+from database.db_session import TenantSession
+
+
+class TenantScoped:
+    """Mixin for tables owned by a tenant.
+
+    Every ORM SELECT/UPDATE/DELETE issued through a TenantSession gets
+    `tenant_id = <session tenant>` added for these models, and new rows are
+    stamped with the session's tenant on flush. Core statements on a plain
+    connection (scheduler, retention job) are deliberately not scoped.
+    """
+
+    tenant_id = Column(String, nullable=False)
+
+
+@event.listens_for(TenantSession, "do_orm_execute")
+def _scope_to_tenant(execute_state):
+    if execute_state.is_column_load or execute_state.is_relationship_load:
+        return
+    if not (execute_state.is_select or execute_state.is_update or execute_state.is_delete):
+        return
+
+    info = execute_state.session.info
+    tenant_id = info.get("tenant_id")
+    if tenant_id is None:
+        raise RuntimeError("Tenant-scoped query on a session without a tenant_id")
+
+    execute_state.statement = execute_state.statement.options(
+        with_loader_criteria(
+            TenantScoped,
+            lambda cls: cls.tenant_id == tenant_id,
+            include_aliases=True,
+        )
+    )
+
+
+@event.listens_for(TenantSession, "before_flush")
+def _assign_tenant(session, flush_context, instances):
+    tenant_id = session.info.get("tenant_id")
+    for obj in session.new:
+        if not isinstance(obj, TenantScoped):
+            continue
+        if obj.tenant_id is None:
+            if tenant_id is None:
+                raise RuntimeError(f"No tenant_id for new {type(obj).__name__}")
+            obj.tenant_id = tenant_id
+        elif tenant_id is not None and obj.tenant_id != tenant_id:
+            raise RuntimeError(f"Cannot write {type(obj).__name__} for another tenant")
@@ -0,0 +1,142 @@
+import os
+import unittest
+from unittest import mock
+
+# database.db_session reads its settings at import time
+os.environ.setdefault("DB_PASSWORD", "")
+
+from fastapi import HTTPException, Response
+from starlette.requests import Request
+
+from campaigns.models.campaign import CampaignModel
+from database import db_session
+from database.db_session import READ_YOUR_WRITES_COOKIE, EnginePair, get_db, resolve_tenant_id
+
+
+def stub_engine(lag=0.0):
+    """Engine whose replica-lag query returns `lag`, or fails when `lag` is an exception."""
+    engine = mock.MagicMock()
+    execute = engine.connect.return_value.__enter__.return_value.execute
+    if isinstance(lag, Exception):
+        execute.side_effect = lag
+    else:
+        execute.return_value.scalar.return_value = lag
+    return engine
+
+
+def make_request(method="GET", cookie=None):
+    headers = [(b"cookie", f"{READ_YOUR_WRITES_COOKIE}={cookie}".encode())] if cookie is not None else []
+    return Request({"type": "http", "method": method, "headers": headers})
+
+
+@mock.patch.object(db_session, "REPLICA_LAG_CHECK_SECONDS", 0)
+class EnginePairTests(unittest.TestCase):
+    def test_round_robin_across_healthy_replicas(self):
+        first, second = stub_engine(), stub_engine(0.5)
+        pair = EnginePair(stub_engine(), [first, second])
+
+        self.assertEqual([pair.reader() for _ in range(4)], [first, second, first, second])
+
+    def test_skips_lagging_and_unreachable_replicas(self):
+        healthy = stub_engine()
+        pair = EnginePair(stub_engine(), [stub_engine(60), stub_engine(OSError("down")), healthy])
+
+        self.assertEqual({pair.reader() for _ in range(3)}, {healthy})
+
+    def test_falls_back_to_primary_when_no_replica_is_healthy(self):
+        # None is what the lag query returns for a replica that stopped streaming
+        writer = stub_engine()
+        pair = EnginePair(writer, [stub_engine(60), stub_engine(None), stub_engine(OSError("down"))])
+
+        self.assertIs(pair.reader(), writer)
+
+    def test_lag_is_cached_between_checks(self):
+        replica = stub_engine()
+        pair = EnginePair(stub_engine(), [replica])
+
+        with mock.patch.object(db_session, "REPLICA_LAG_CHECK_SECONDS", 60):
+            pair.reader()
+            pair.reader()
+
+        self.assertEqual(replica.connect.call_count, 1)
+
+
+class GetDbTests(unittest.TestCase):
+    def setUp(self):
+        self.writer, self.replica = stub_engine(), stub_engine()
+        self.pair = EnginePair(self.writer, [self.replica])
+        patcher = mock.patch.object(db_session, "get_engine_pair", return_value=self.pair)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def open_db(self, request, response=None):
+        dependency = get_db(request, response or Response(), "acme")
+        db = next(dependency)
+        self.addCleanup(dependency.close)
+        return db
+
+    def test_reads_use_a_read_only_replica_session(self):
+        db = self.open_db(make_request())
+
+        self.assertIs(db.get_bind(), self.replica)
+        self.assertTrue(db.info["read_only"])
+        self.assertEqual(db.info["tenant_id"], "acme")
+
+    def test_write_pins_the_client_to_the_primary(self):
+        response = Response()
+        db = self.open_db(make_request("POST"), response)
+
+        self.assertIs(db.get_bind(), self.writer)
+        self.assertIn(READ_YOUR_WRITES_COOKIE, response.headers["set-cookie"])
+
+    def test_cookie_keeps_reads_on_the_primary(self):
+        now = 1_700_000_000
+        with mock.patch.object(db_session.time, "time", return_value=now):
+            pinned = self.open_db(make_request(cookie=now + 5))
+            expired = self.open_db(make_request(cookie=now - 1))
+            garbage = self.open_db(make_request(cookie="soon"))
+
+        self.assertIs(pinned.get_bind(), self.writer)
+        self.assertFalse(pinned.info["read_only"])
+        self.assertIs(expired.get_bind(), self.replica)
+        self.assertIs(garbage.get_bind(), self.replica)
+
+    def test_replica_session_refuses_to_flush(self):
+        db = self.open_db(make_request())
+        db.add(CampaignModel(title="Spring outreach"))
+        # Forget the lag check; the flush itself must not reach the replica
+        self.replica.reset_mock()
+
+        with self.assertRaisesRegex(RuntimeError, "read-replica"):
+            db.flush()
+        self.replica.connect.assert_not_called()
+
+
+@mock.patch.object(db_session, "TENANT_GATEWAY_SECRET", "gateway-secret")
+@mock.patch.object(db_session, "DEFAULT_TENANT_ID", "default")
+class ResolveTenantTests(unittest.TestCase):
+    def assert_status(self, status, *args):
+        with self.assertRaises(HTTPException) as raised:
+            resolve_tenant_id(*args)
+        self.assertEqual(raised.exception.status_code, status)
+
+    def test_gateway_request_uses_header_or_default_tenant(self):
+        self.assertEqual(resolve_tenant_id("acme", "gateway-secret"), "acme")
+        self.assertEqual(resolve_tenant_id(None, "gateway-secret"), "default")
+
+    def test_tenant_header_without_gateway_token_is_rejected(self):
+        self.assert_status(403, "acme", None)
+        self.assert_status(403, "acme", "wrong")
+
+    def test_default_tenant_also_requires_gateway_token(self):
+        self.assert_status(403, None, None)
+        self.assert_status(403, None, "wrong")
+
+    def test_missing_secret_rejects_everything(self):
+        with mock.patch.object(db_session, "TENANT_GATEWAY_SECRET", None):
+            self.assert_status(403, None, "")
+            self.assert_status(403, "acme", "")
+
+    def test_header_required_without_default_tenant(self):
+        with mock.patch.object(db_session, "DEFAULT_TENANT_ID", None):
+            self.assert_status(400, None, "gateway-secret")
@@ -0,0 +1,103 @@
+import os
+import unittest
+
+# database.db_session reads its settings at import time
+os.environ.setdefault("DB_PASSWORD", "")
+
+from sqlalchemy import Column, Integer, String, create_engine, func, insert, select
+from sqlalchemy.orm import declarative_base
+
+from database.db_session import TenantSession
+from database.tenancy import TenantScoped
+
+# Own metadata so SQLite never sees the Postgres-only columns of the real models
+ScopedBase = declarative_base()
+
+
+class Note(TenantScoped, ScopedBase):
+    __tablename__ = "notes"
+
+    id = Column(Integer, primary_key=True)
+    body = Column(String, nullable=False)
+
+
+class TenantScopingTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        ScopedBase.metadata.create_all(self.engine)
+        with self.engine.begin() as conn:
+            conn.execute(
+                insert(Note),
+                [
+                    {"id": 1, "tenant_id": "acme", "body": "acme first"},
+                    {"id": 2, "tenant_id": "acme", "body": "acme second"},
+                    {"id": 3, "tenant_id": "globex", "body": "globex only"},
+                ],
+            )
+
+    def session(self, tenant_id="acme"):
+        db = TenantSession(bind=self.engine, info={"tenant_id": tenant_id})
+        self.addCleanup(db.close)
+        return db
+
+    def rows(self):
+        with self.engine.connect() as conn:
+            return {row.id: row for row in conn.execute(select(Note.__table__))}
+
+    def test_entity_queries_only_see_own_tenant(self):
+        db = self.session()
+
+        self.assertEqual(sorted(note.id for note in db.query(Note)), [1, 2])
+        self.assertEqual([note.id for note in db.scalars(select(Note))], [1, 2])
+        self.assertIsNone(db.query(Note).filter(Note.id == 3).first())
+
+    def test_column_only_and_aggregate_queries_are_scoped(self):
+        db = self.session()
+
+        self.assertEqual(sorted(body for body, in db.query(Note.body)), ["acme first", "acme second"])
+        self.assertEqual(db.query(func.count(Note.id)).scalar(), 2)
+        self.assertEqual(db.scalar(select(func.max(Note.id))), 2)
+
+    def test_bulk_update_and_delete_only_touch_own_tenant(self):
+        db = self.session()
+
+        updated = db.query(Note).update({Note.body: "changed"}, synchronize_session=False)
+        deleted = db.query(Note).filter(Note.id.in_([2, 3])).delete(synchronize_session=False)
+        db.commit()
+
+        self.assertEqual((updated, deleted), (2, 1))
+        rows = self.rows()
+        self.assertEqual(sorted(rows), [1, 3])
+        self.assertEqual(rows[1].body, "changed")
+        self.assertEqual(rows[3].body, "globex only")
+
+    def test_query_without_tenant_is_refused(self):
+        db = TenantSession(bind=self.engine)
+        self.addCleanup(db.close)
+
+        with self.assertRaises(RuntimeError):
+            db.query(Note).all()
+        with self.assertRaises(RuntimeError):
+            db.query(func.count(Note.id)).scalar()
+
+    def test_new_rows_are_stamped_with_session_tenant(self):
+        db = self.session("globex")
+        db.add(Note(id=4, body="new"))
+        db.commit()
+
+        self.assertEqual(self.rows()[4].tenant_id, "globex")
+
+    def test_insert_for_another_tenant_is_refused(self):
+        db = self.session()
+        db.add(Note(id=4, tenant_id="globex", body="smuggled"))
+
+        with self.assertRaisesRegex(RuntimeError, "another tenant"):
+            db.flush()
+
+    def test_insert_without_any_tenant_is_refused(self):
+        db = TenantSession(bind=self.engine)
+        self.addCleanup(db.close)
+        db.add(Note(id=4, body="orphan"))
+
+        with self.assertRaisesRegex(RuntimeError, "No tenant_id"):
+            db.flush()
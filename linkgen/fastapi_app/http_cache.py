@@ -0,0 +1,60 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from fastapi import Request, Response
+
+
+def make_etag(*parts):
+    """Weak ETag derived from row-version data, so it can be computed without loading the row."""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def _utc(value):
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _settled(last_modified):
+    """True once the second of last_modified has passed.
+
+    Last-Modified only has whole-second precision, so a value sent while its
+    second is still running could be shared by a later update in that same
+    second and turn If-Modified-Since into a wrong 304.
+    """
+    return _utc(last_modified).replace(microsecond=0) < datetime.now(timezone.utc).replace(microsecond=0)
+
+
+def is_conditional(request: Request):
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, etag, last_modified=None):
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # Weak comparison, as GET revalidation allows
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or etag.removeprefix("W/") in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        # Safe because Last-Modified is only sent once its second is over (see _settled)
+        return _utc(last_modified).replace(microsecond=0) <= _utc(since)
+    return False
+
+
+def cache_headers(etag, last_modified=None):
+    # no-cache: clients may store the response but must revalidate it every time
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if last_modified is not None and _settled(last_modified):
+        headers["Last-Modified"] = format_datetime(_utc(last_modified), usegmt=True)
+    return headers
+
+
+def not_modified_response(etag, last_modified=None):
+    return Response(status_code=304, headers=cache_headers(etag, last_modified))
@@ -0,0 +1,264 @@
+import asyncio
+import hashlib
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from database.db_session import resolve_tenant_id
+
+# Load environment variables from .env file
+load_dotenv()
+
+# How long a completed response is replayed for a repeated key
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+# How long a duplicate waits for the original request before giving up with 409
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "30"))
+# How long an in-progress key stays claimed if its owner never finishes; keep it above the slowest request
+IDEMPOTENCY_PENDING_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_PENDING_TTL_SECONDS", "300"))
+# Shared store for multi-process deployments; in-process store when unset
+IDEMPOTENCY_REDIS_URL = os.getenv("IDEMPOTENCY_REDIS_URL")
+
+IDEMPOTENT_METHODS = ("POST", "PUT")
+HEADER = b"idempotency-key"
+TENANT_HEADER = b"x-tenant-id"
+GATEWAY_TOKEN_HEADER = b"x-tenant-gateway-token"
+
+
+class InMemoryIdempotencyStore:
+    """Per-process key -> response store. Duplicates await the first request's event.
+
+    Pending and completed entries are kept in separate dicts: each has a fixed
+    TTL, so insertion order equals expiry order and purging stops at the first
+    live entry.
+    """
+
+    def __init__(self, ttl=IDEMPOTENCY_TTL_SECONDS, pending_ttl=IDEMPOTENCY_PENDING_TTL_SECONDS):
+        self.ttl = ttl
+        self.pending_ttl = pending_ttl
+        self._pending = OrderedDict()
+        self._entries = OrderedDict()
+
+    def _purge(self):
+        now = time.monotonic()
+        for entries in (self._pending, self._entries):
+            while entries:
+                key, entry = next(iter(entries.items()))
+                if entry["expires_at"] > now:
+                    break
+                entries.popitem(last=False)
+                # Waiters on an abandoned key retry as owner
+                entry["event"].set()
+
+    async def begin(self, key, fingerprint, wait_timeout=IDEMPOTENCY_WAIT_SECONDS):
+        """Return (token, None) if the caller owns the key, else (None, record or None on timeout)."""
+        self._purge()
+        entry = self._entries.get(key)
+        if entry is not None:
+            return None, entry["record"]
+
+        entry = self._pending.get(key)
+        if entry is None:
+            token = uuid.uuid4().hex
+            self._pending[key] = {
+                "token": token,
+                "event": asyncio.Event(),
+                "expires_at": time.monotonic() + self.pending_ttl,
+            }
+            return token, None
+
+        try:
+            await asyncio.wait_for(entry["event"].wait(), wait_timeout)
+        except asyncio.TimeoutError:
+            return None, None
+        # Completed, or released by a failed original request (then retry as owner)
+        return await self.begin(key, fingerprint, wait_timeout)
+
+    def _pop_owned(self, key, token):
+        entry = self._pending.get(key)
+        if entry is None or entry["token"] != token:
+            return None
+        return self._pending.pop(key)
+
+    async def complete(self, key, token, record):
+        pending = self._pop_owned(key, token)
+        if pending is None:
+            # The claim expired and another request owns the key now
+            return
+        self._entries[key] = {
+            "event": pending["event"],
+            "record": record,
+            "expires_at": time.monotonic() + self.ttl,
+        }
+        pending["event"].set()
+
+    async def release(self, key, token):
+        pending = self._pop_owned(key, token)
+        if pending is not None:
+            pending["event"].set()
+
+
+class RedisIdempotencyStore:
+    """Redis-backed store shared by every API process.
+
+    An in-progress key holds "pending:<token>"; complete and release only
+    touch the key while it still carries the caller's token.
+    """
+
+    PENDING = "pending:"
+    POLL_SECONDS = 0.05
+
+    COMPLETE_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('set', KEYS[1], ARGV[2], 'EX', ARGV[3])
+    end
+    return nil
+    """
+    RELEASE_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('del', KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, url=IDEMPOTENCY_REDIS_URL, ttl=IDEMPOTENCY_TTL_SECONDS, pending_ttl=IDEMPOTENCY_PENDING_TTL_SECONDS):
+        import redis.asyncio as redis
+
+        self.redis = redis.from_url(url)
+        self.ttl = ttl
+        self.pending_ttl = pending_ttl
+        self._complete = self.redis.register_script(self.COMPLETE_SCRIPT)
+        self._release = self.redis.register_script(self.RELEASE_SCRIPT)
+
+    async def begin(self, key, fingerprint, wait_timeout=IDEMPOTENCY_WAIT_SECONDS):
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + wait_timeout
+        while True:
+            # The pending marker expires on its own if the owning process dies
+            if await self.redis.set(key, self.PENDING + token, nx=True, ex=self.pending_ttl):
+                return token, None
+            value = await self.redis.get(key)
+            if value is not None and not value.startswith(self.PENDING.encode()):
+                return None, json.loads(value)
+            if time.monotonic() >= deadline:
+                return None, None
+            await asyncio.sleep(self.POLL_SECONDS)
+
+    async def complete(self, key, token, record):
+        await self._complete(keys=[key], args=[self.PENDING + token, json.dumps(record), self.ttl])
+
+    async def release(self, key, token):
+        await self._release(keys=[key], args=[self.PENDING + token])
+
+
+def get_idempotency_store():
+    if IDEMPOTENCY_REDIS_URL:
+        return RedisIdempotencyStore()
+    return InMemoryIdempotencyStore()
+
+
+class IdempotencyMiddleware:
+    """Answers retried POST/PUT requests carrying an Idempotency-Key from the store.
+
+    A replay never reaches the route, so it opens no DB session. Concurrent
+    duplicates wait for the first request's response. Reusing a key with a
+    different body is rejected with 422. 5xx responses are not stored, so
+    the client can retry them.
+    """
+
+    def __init__(self, app, store=None):
+        self.app = app
+        self.store = store or get_idempotency_store()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in IDEMPOTENT_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        key = headers.get(HEADER)
+        if not key:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            # Same tenant the route will see, so a missing header and the default tenant share keys
+            tenant = resolve_tenant_id(
+                headers.get(TENANT_HEADER, b"").decode("latin-1"),
+                headers.get(GATEWAY_TOKEN_HEADER, b"").decode("latin-1"),
+            )
+        except HTTPException:
+            # The route rejects the request; never replay another tenant's response
+            await self.app(scope, receive, send)
+            return
+
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        fingerprint = hashlib.sha256(body).hexdigest()
+        store_key = f"idempotency:{tenant}:{scope['method']}:{scope['path']}:{key.decode('latin-1')}"
+
+        token, record = await self.store.begin(store_key, fingerprint)
+        if token is None:
+            if record is None:
+                response = JSONResponse(
+                    {"detail": "A request with this Idempotency-Key is still in progress"}, status_code=409
+                )
+            elif record["fingerprint"] != fingerprint:
+                response = JSONResponse(
+                    {"detail": "Idempotency-Key was already used with a different request body"}, status_code=422
+                )
+            else:
+                await self._replay(record, send)
+                return
+            await response(scope, receive, send)
+            return
+
+        async def replay_receive():
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        captured = {"status": 500, "headers": [], "body": b""}
+
+        async def capture_send(message):
+            if message["type"] == "http.response.start":
+                captured["status"] = message["status"]
+                captured["headers"] = [
+                    [name.decode("latin-1"), value.decode("latin-1")] for name, value in message.get("headers", [])
+                ]
+            elif message["type"] == "http.response.body":
+                captured["body"] += message.get("body", b"")
+            await send(message)
+
+        completed = False
+        try:
+            await self.app(scope, replay_receive, capture_send)
+            if captured["status"] < 500:
+                await self.store.complete(
+                    store_key,
+                    token,
+                    {
+                        "fingerprint": fingerprint,
+                        "status": captured["status"],
+                        "headers": captured["headers"],
+                        "body": captured["body"].decode("latin-1"),
+                    },
+                )
+                completed = True
+        finally:
+            # Errors, 5xx and cancelled requests (client disconnects) free the key for a retry
+            if not completed:
+                await self.store.release(store_key, token)
+
+    @staticmethod
+    async def _replay(record, send):
+        headers = [(name.encode("latin-1"), value.encode("latin-1")) for name, value in record["headers"]]
+        headers.append((b"idempotent-replayed", b"true"))
+        await send({"type": "http.response.start", "status": record["status"], "headers": headers})
+        await send({"type": "http.response.body", "body": record["body"].encode("latin-1")})
@@ -1,11 +1,31 @@
+import asyncio
 from fastapi import FastAPI
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi_app.idempotency import IdempotencyMiddleware
 from campaigns.routes.campaign import campaign_router
 from campaigns.routes.message_template import message_template_router
 from profiles.routes.profile import profile_router
+from profiles.routes.interaction import interaction_router
+from profiles.retention import keep_partitions_ahead
+from search.routes.search import search_router
 
 
 app = FastAPI()
 
+
+@app.on_event("startup")
+async def start_partition_maintenance():
+    # Keep upcoming interaction partitions created even if the retention cron is not running
+    app.state.partition_task = asyncio.create_task(keep_partitions_ahead())
+
+
+# Replays retried POST/PUT requests that carry an Idempotency-Key header
+app.add_middleware(IdempotencyMiddleware)
+# Outermost, so stored idempotent responses stay uncompressed
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 app.include_router(campaign_router, prefix="/api/v1/campaigns", tags=["Campaigns"])
 app.include_router(message_template_router, prefix="/api/v1/message_templates", tags=["Message Templates"])
-app.include_router(profile_router, prefix="/api/v1/profiles", tags=["Profiles"])
\ No newline at end of file
+app.include_router(profile_router, prefix="/api/v1/profiles", tags=["Profiles"])
+app.include_router(interaction_router, prefix="/api/v1/profiles", tags=["Profile Interactions"])
+app.include_router(search_router, prefix="/api/v1/search", tags=["Search"])
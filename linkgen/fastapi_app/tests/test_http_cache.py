@@ -0,0 +1,30 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+from starlette.requests import Request
+
+from fastapi_app.http_cache import cache_headers, is_not_modified
+
+
+def make_request(**headers):
+    return Request({"type": "http", "headers": [(k.replace("_", "-").encode(), v.encode()) for k, v in headers.items()]})
+
+
+class LastModifiedTests(unittest.TestCase):
+    def test_not_sent_while_its_second_is_running(self):
+        self.assertNotIn("Last-Modified", cache_headers('W/"a"', datetime.now(timezone.utc)))
+
+    def test_sent_once_its_second_is_over(self):
+        last_modified = datetime.now(timezone.utc) - timedelta(seconds=2)
+        self.assertEqual(
+            cache_headers('W/"a"', last_modified)["Last-Modified"], format_datetime(last_modified, usegmt=True)
+        )
+
+    def test_update_after_the_served_second_is_modified(self):
+        served = (datetime.now(timezone.utc) - timedelta(seconds=5)).replace(microsecond=300000)
+        since = cache_headers('W/"a"', served)["Last-Modified"]
+        request = make_request(if_modified_since=since)
+
+        self.assertTrue(is_not_modified(request, 'W/"b"', served))
+        self.assertFalse(is_not_modified(request, 'W/"b"', served + timedelta(seconds=1)))
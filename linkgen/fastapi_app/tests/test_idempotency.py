@@ -0,0 +1,114 @@
+import asyncio
+import json
+import os
+import unittest
+from unittest import mock
+
+# database.db_session reads its settings at import time
+os.environ.setdefault("DB_PASSWORD", "")
+
+from fastapi_app.idempotency import IdempotencyMiddleware, InMemoryIdempotencyStore
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class InMemoryStoreTests(unittest.TestCase):
+    def test_duplicate_replays_completed_record(self):
+        async def scenario():
+            store = InMemoryIdempotencyStore()
+            token, _ = await store.begin("k", "fp")
+            await store.complete("k", token, {"fingerprint": "fp"})
+            return await store.begin("k", "fp")
+
+        self.assertEqual(run(scenario()), (None, {"fingerprint": "fp"}))
+
+    def test_expired_pending_key_is_purged_and_reclaimed(self):
+        async def scenario():
+            store = InMemoryIdempotencyStore(pending_ttl=0)
+            first, _ = await store.begin("k", "fp")
+            second, _ = await store.begin("k", "fp")
+            # The original owner finishing late must not overwrite the new claim
+            await store.complete("k", first, {"fingerprint": "stale"})
+            await store.complete("k", second, {"fingerprint": "fp"})
+            return first, second, await store.begin("k", "fp")
+
+        first, second, (token, record) = run(scenario())
+        self.assertNotEqual(first, second)
+        self.assertIsNone(token)
+        self.assertEqual(record, {"fingerprint": "fp"})
+
+
+GATEWAY = [(b"x-tenant-gateway-token", b"gateway-secret")]
+
+
+@mock.patch("database.db_session.TENANT_GATEWAY_SECRET", "gateway-secret")
+@mock.patch("database.db_session.DEFAULT_TENANT_ID", "default")
+class MiddlewareTests(unittest.TestCase):
+    def make_scope(self, headers):
+        return {
+            "type": "http",
+            "method": "POST",
+            "path": "/api/v1/campaigns/",
+            "headers": [(b"idempotency-key", b"abc"), *headers],
+        }
+
+    async def call(self, middleware, headers=GATEWAY):
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"{}", "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        await middleware(self.make_scope(headers), receive, send)
+        return sent
+
+    def test_cancelled_request_releases_key(self):
+        started = asyncio.Event()
+
+        async def slow_app(scope, receive, send):
+            started.set()
+            await asyncio.sleep(10)
+
+        async def ok_app(scope, receive, send):
+            await send({"type": "http.response.start", "status": 201, "headers": []})
+            await send({"type": "http.response.body", "body": json.dumps({"id": 1}).encode()})
+
+        async def scenario():
+            store = InMemoryIdempotencyStore()
+            task = asyncio.create_task(self.call(IdempotencyMiddleware(slow_app, store=store)))
+            await started.wait()
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            # The retry becomes owner instead of waiting on an orphaned pending key
+            return await asyncio.wait_for(self.call(IdempotencyMiddleware(ok_app, store=store)), 1)
+
+        sent = run(scenario())
+        self.assertEqual(sent[0]["status"], 201)
+
+    def test_tenant_is_normalized_and_verified_before_keying(self):
+        calls = []
+
+        async def app(scope, receive, send):
+            calls.append(scope)
+            await send({"type": "http.response.start", "status": 201, "headers": []})
+            await send({"type": "http.response.body", "body": b"{}"})
+
+        async def scenario():
+            middleware = IdempotencyMiddleware(app, store=InMemoryIdempotencyStore())
+            await self.call(middleware)
+            # Explicit default tenant via the gateway: replayed from the same key
+            replay = await self.call(middleware, [(b"x-tenant-id", b"default"), *GATEWAY])
+            # Without the gateway token, with or without a tenant header: passed to
+            # the route (which rejects it), never replayed
+            await self.call(middleware, [(b"x-tenant-id", b"default")])
+            await self.call(middleware, [])
+            return replay
+
+        replay = run(scenario())
+        self.assertIn((b"idempotent-replayed", b"true"), replay[0]["headers"])
+        self.assertEqual(len(calls), 3)
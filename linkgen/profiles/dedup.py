@@ -0,0 +1,235 @@
+import os
+import re
+import unicodedata
+from collections import defaultdict
+from sqlalchemy import func, or_
+from profiles.models.interaction_event import InteractionEvent
+from profiles.models.profile import ProfileModel
+from profiles.models.profile_alias import ProfileAlias
+
+# Score at which two profiles are offered as match candidates
+CANDIDATE_THRESHOLD = float(os.getenv("PROFILE_MATCH_THRESHOLD", "0.5"))
+# Score at which an incoming profile is merged into an existing one on upsert
+MERGE_THRESHOLD = float(os.getenv("PROFILE_MERGE_THRESHOLD", "0.8"))
+# Weight of the name score when both profiles have a company
+NAME_WEIGHT = 0.7
+
+_CHUNK_SIZE = 1000
+
+_NAME_NOISE = {"mr", "mrs", "ms", "dr", "prof", "jr", "sr", "ii", "iii", "phd", "mba", "md"}
+_COMPANY_NOISE = {"inc", "llc", "ltd", "limited", "corp", "corporation", "co", "company", "gmbh", "plc", "sa", "ag", "the"}
+_NON_WORD = re.compile(r"[^a-z0-9 ]+")
+
+
+def _tokens(value, noise):
+    value = unicodedata.normalize("NFKD", value or "").encode("ascii", "ignore").decode()
+    value = _NON_WORD.sub(" ", value.lower())
+    return [token for token in value.split() if token not in noise]
+
+
+def normalize_name(name):
+    return " ".join(_tokens(name, _NAME_NOISE))
+
+
+def normalize_company(company):
+    return " ".join(_tokens(company, _COMPANY_NOISE))
+
+
+def _skeleton(word):
+    """First letter plus the following consonants, vowels and repeats removed (smith/smyth -> smth)."""
+    if not word:
+        return ""
+    out = word[0]
+    for char in word[1:]:
+        if char in "aeiouy" or char == out[-1]:
+            continue
+        out += char
+    return out[:4]
+
+
+def blocking_key(name_key):
+    """Coarse key that near-duplicate names share: first initial + surname skeleton."""
+    parts = name_key.split()
+    if not parts:
+        return ""
+    return f"{parts[0][0]}:{_skeleton(parts[-1])}"
+
+
+def match_keys(name, company):
+    name_key = normalize_name(name)
+    return name_key, normalize_company(company), blocking_key(name_key)
+
+
+def apply_match_keys(db_profile):
+    db_profile.name_key, db_profile.company_key, db_profile.block_key = match_keys(
+        db_profile.name, db_profile.company
+    )
+
+
+def trigrams(value):
+    """Trigram set built the same way as pg_trgm (words padded with two leading and one trailing space)."""
+    grams = set()
+    for word in value.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def _similarity(left, right):
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def _score(name_grams, company_grams, other_name_grams, other_company_grams):
+    name_score = _similarity(name_grams, other_name_grams)
+    if not company_grams or not other_company_grams:
+        return name_score
+    company_score = _similarity(company_grams, other_company_grams)
+    return NAME_WEIGHT * name_score + (1 - NAME_WEIGHT) * company_score
+
+
+class ProfileIndex:
+    """In-memory blocking index; candidates are only scored within their block."""
+
+    def __init__(self):
+        self._blocks = defaultdict(list)
+
+    def add(self, profile_id, name_key, company_key, block_key):
+        self._blocks[block_key].append((profile_id, trigrams(name_key), trigrams(company_key)))
+
+    def candidates(self, name_key, company_key, block_key, threshold=CANDIDATE_THRESHOLD, exclude_id=None):
+        """Return [(profile_id, score)] at or above threshold, best first."""
+        name_grams, company_grams = trigrams(name_key), trigrams(company_key)
+        matches = []
+        for profile_id, other_name, other_company in self._blocks.get(block_key, ()):
+            if profile_id == exclude_id:
+                continue
+            score = _score(name_grams, company_grams, other_name, other_company)
+            if score >= threshold:
+                matches.append((profile_id, score))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
+
+
+def _chunks(values):
+    values = list(values)
+    for start in range(0, len(values), _CHUNK_SIZE):
+        yield values[start:start + _CHUNK_SIZE]
+
+
+def find_matches(db, name, company=None, threshold=CANDIDATE_THRESHOLD, limit=10, exclude_id=None):
+    """Match one profile against the store using its block and the pg_trgm index.
+
+    Returns [(ProfileModel, score)], best first.
+    """
+    name_key, company_key, block_key = match_keys(name, company)
+    if not name_key:
+        return []
+
+    rows = (
+        db.query(ProfileModel)
+        .filter(or_(ProfileModel.block_key == block_key, ProfileModel.name_key.op("%")(name_key)))
+        .order_by(func.similarity(ProfileModel.name_key, name_key).desc())
+        .limit(limit * 5)
+        .all()
+    )
+
+    name_grams, company_grams = trigrams(name_key), trigrams(company_key)
+    matches = []
+    for row in rows:
+        if row.id == exclude_id:
+            continue
+        score = _score(name_grams, company_grams, trigrams(row.name_key), trigrams(row.company_key))
+        if score >= threshold:
+            matches.append((row, score))
+    matches.sort(key=lambda match: match[1], reverse=True)
+    return matches[:limit]
+
+
+def resolve_profile_id(db, profile_id):
+    """Canonical id for a profile id that may have been merged into another profile."""
+    alias = db.query(ProfileAlias.profile_id).filter(ProfileAlias.alias_id == profile_id).first()
+    return alias.profile_id if alias else profile_id
+
+
+def _merge_into(target, incoming):
+    """Fill fields the existing profile is missing; existing values win."""
+    for field in ("headline", "company", "location"):
+        if not getattr(target, field) and getattr(incoming, field):
+            setattr(target, field, getattr(incoming, field))
+
+
+def upsert_profiles(db, profiles, merge_threshold=MERGE_THRESHOLD):
+    """Insert or update a batch of profiles, merging near-duplicates.
+
+    Existing rows are only loaded for the ids and blocking keys present in the
+    batch, so the work grows with the import size rather than the store size.
+    A merged source id is recorded as an alias of the surviving profile and
+    its interaction events are moved there once; re-importing the same source
+    id later updates the surviving profile instead of merging again.
+    """
+    keyed = [(profile, match_keys(profile.name, profile.company)) for profile in profiles]
+    incoming_ids = {profile.id for profile, _ in keyed}
+
+    aliases = {}
+    for chunk in _chunks(incoming_ids):
+        for alias in db.query(ProfileAlias).filter(ProfileAlias.alias_id.in_(chunk)):
+            aliases[alias.alias_id] = alias.profile_id
+
+    by_id = {}
+    for chunk in _chunks(incoming_ids | set(aliases.values())):
+        for row in db.query(ProfileModel).filter(ProfileModel.id.in_(chunk)):
+            by_id[row.id] = row
+
+    index = ProfileIndex()
+    blocks = {
+        keys[2] for profile, keys in keyed
+        if profile.id not in by_id and profile.id not in aliases and keys[2]
+    }
+    for chunk in _chunks(blocks):
+        for row in db.query(ProfileModel).filter(ProfileModel.block_key.in_(chunk)):
+            by_id.setdefault(row.id, row)
+            index.add(row.id, row.name_key, row.company_key, row.block_key)
+
+    created, updated, merged = 0, 0, []
+    for profile, (name_key, company_key, block_key) in keyed:
+        existing = by_id.get(profile.id)
+        if existing is not None:
+            for key, value in profile.model_dump().items():
+                setattr(existing, key, value)
+            apply_match_keys(existing)
+            updated += 1
+            continue
+
+        if profile.id in aliases:
+            # Already merged on an earlier import: the surviving profile keeps its values
+            target = by_id[aliases[profile.id]]
+            _merge_into(target, profile)
+            apply_match_keys(target)
+            updated += 1
+            continue
+
+        candidates = index.candidates(name_key, company_key, block_key, threshold=merge_threshold)
+        if candidates:
+            target_id, score = candidates[0]
+            _merge_into(by_id[target_id], profile)
+            apply_match_keys(by_id[target_id])
+            db.query(InteractionEvent).filter(InteractionEvent.profile_id == profile.id).update(
+                {InteractionEvent.profile_id: target_id}, synchronize_session=False
+            )
+            db.add(ProfileAlias(alias_id=profile.id, profile_id=target_id))
+            aliases[profile.id] = target_id
+            merged.append({"source_id": profile.id, "profile_id": target_id, "score": round(score, 3)})
+            continue
+
+        db_profile = ProfileModel(**profile.model_dump())
+        apply_match_keys(db_profile)
+        db.add(db_profile)
+        by_id[db_profile.id] = db_profile
+        # Later rows in the same batch can merge into this one
+        index.add(db_profile.id, name_key, company_key, block_key)
+        created += 1
+
+    db.commit()
+    return {"created": created, "updated": updated, "merged": merged}
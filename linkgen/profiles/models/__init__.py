@@ -0,0 +1,3 @@
+from .profile import ProfileModel
+from .profile_alias import ProfileAlias
+from .interaction_event import InteractionEvent
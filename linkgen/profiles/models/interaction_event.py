@@ -0,0 +1,18 @@
+from sqlalchemy import BigInteger, Column, DateTime, Index, String, func
+from database.db_session import Base
+from database.tenancy import TenantScoped
+
+class InteractionEvent(TenantScoped, Base):
+    __tablename__ = "profile_interactions"
+    __table_args__ = (
+        Index("ix_profile_interactions_tenant_id_profile_id_ts", "tenant_id", "profile_id", "ts"),
+        # Monthly range partitions are managed by profiles/retention.py
+        {"postgresql_partition_by": "RANGE (ts)"},
+    )
+
+    # Postgres requires the partition key to be part of the primary key
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    ts = Column(DateTime(timezone=True), primary_key=True, nullable=False, server_default=func.now())
+    profile_id = Column(String, nullable=False)
+    event_type = Column(String, nullable=False)  # e.g. connection_sent, message_sent, reply_received
+    detail = Column(String, nullable=True)
@@ -1,11 +1,43 @@
-from pydantic import BaseModel
-from typing import Optional
-
-class LinkedInProfile(BaseModel):
-    id: str
-    name: str
-    headline: Optional[str] = None
-    company: Optional[str] = None
-    location: Optional[str] = None
-    connection_status: str  # pending, connected, declined
-    interaction_history: list
\ No newline at end of file
+from sqlalchemy import Column, Computed, Index, String
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from database.db_session import Base
+from database.tenancy import TenantScoped
+
+class ProfileModel(TenantScoped, Base):
+    __tablename__ = "profiles"
+    __table_args__ = (
+        # Trigram index for fuzzy name lookups within a tenant (requires pg_trgm and btree_gin)
+        Index(
+            "ix_profiles_tenant_id_name_key_trgm",
+            "tenant_id",
+            "name_key",
+            postgresql_using="gin",
+            postgresql_ops={"name_key": "gin_trgm_ops"},
+        ),
+        Index("ix_profiles_tenant_id_search_vector", "tenant_id", "search_vector", postgresql_using="gin"),
+        Index("ix_profiles_tenant_id_block_key", "tenant_id", "block_key"),
+    )
+
+    # The same LinkedIn member can be a lead for several tenants
+    tenant_id = Column(String, primary_key=True)
+    id = Column(String, primary_key=True, index=True)
+    name = Column(String, nullable=False)
+    headline = Column(String, nullable=True)
+    company = Column(String, nullable=True)
+    location = Column(String, nullable=True)
+    connection_status = Column(String, nullable=False, default="pending")  # pending, connected, declined
+
+    # Normalized match keys maintained by profiles/dedup.py
+    name_key = Column(String, nullable=False, default="")
+    company_key = Column(String, nullable=False, default="")
+    block_key = Column(String, nullable=False, default="")
+
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('english', coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(headline, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(company, '')), 'B')",
+            persisted=True,
+        ),
+    )
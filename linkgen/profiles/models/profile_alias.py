@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String
+from database.db_session import Base
+from database.tenancy import TenantScoped
+
+class ProfileAlias(TenantScoped, Base):
+    """A source id that was merged into another profile by profiles/dedup.py."""
+
+    __tablename__ = "profile_aliases"
+
+    tenant_id = Column(String, primary_key=True)
+    alias_id = Column(String, primary_key=True)
+    profile_id = Column(String, nullable=False)
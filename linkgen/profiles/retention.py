@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import os
+import re
+from datetime import date
+from sqlalchemy import text
+from database.db_session import all_engines
+
+logger = logging.getLogger(__name__)
+
+INTERACTION_TABLE = "profile_interactions"
+# Catches rows whose month has no partition yet; ensure_partitions moves them out
+DEFAULT_PARTITION = f"{INTERACTION_TABLE}_default"
+
+# How many whole months of interaction events to keep
+RETENTION_MONTHS = int(os.getenv("INTERACTION_RETENTION_MONTHS", "12"))
+# How many future monthly partitions to keep created ahead of time
+PARTITIONS_AHEAD = int(os.getenv("INTERACTION_PARTITIONS_AHEAD", "2"))
+# How often the API process re-checks that upcoming partitions exist
+PARTITION_CHECK_SECONDS = float(os.getenv("INTERACTION_PARTITION_CHECK_SECONDS", "21600"))
+
+_PARTITION_RE = re.compile(rf"^{INTERACTION_TABLE}_y(\d{{4}})m(\d{{2}})$")
+
+
+def month_start(day):
+    return date(day.year, day.month, 1)
+
+
+def add_months(month, count):
+    index = month.year * 12 + (month.month - 1) + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month):
+    return f"{INTERACTION_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def list_partitions(conn):
+    """Return {month: partition_name} for the attached monthly partitions."""
+    rows = conn.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON pg_inherits.inhparent = parent.oid
+            JOIN pg_class child ON pg_inherits.inhrelid = child.oid
+            WHERE parent.relname = :parent
+            """
+        ),
+        {"parent": INTERACTION_TABLE},
+    )
+    partitions = {}
+    for (name,) in rows:
+        match = _PARTITION_RE.match(name)
+        if match:
+            partitions[date(int(match.group(1)), int(match.group(2)), 1)] = name
+    return partitions
+
+
+def _months_in_default(conn):
+    rows = conn.execute(text(f"SELECT DISTINCT date_trunc('month', ts)::date FROM {DEFAULT_PARTITION}"))
+    return {row[0] for row in rows}
+
+
+def create_partition(conn, month):
+    """Create the month's partition, moving any of its rows out of the DEFAULT partition.
+
+    Postgres refuses to create a partition while DEFAULT holds rows in its
+    range, so DEFAULT is detached for the move and re-attached afterwards.
+    """
+    name = partition_name(month)
+    bounds = {"start": month, "end": add_months(month, 1)}
+    in_default = conn.execute(
+        text(f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} WHERE ts >= :start AND ts < :end)"),
+        bounds,
+    ).scalar()
+
+    if in_default:
+        conn.execute(text(f"ALTER TABLE {INTERACTION_TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+    conn.execute(
+        text(
+            f"CREATE TABLE {name} PARTITION OF {INTERACTION_TABLE} "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+        )
+    )
+    if in_default:
+        conn.execute(
+            text(f"INSERT INTO {name} SELECT * FROM {DEFAULT_PARTITION} WHERE ts >= :start AND ts < :end"),
+            bounds,
+        )
+        conn.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE ts >= :start AND ts < :end"), bounds)
+        conn.execute(text(f"ALTER TABLE {INTERACTION_TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT"))
+    return name
+
+
+def ensure_partitions(conn, today=None, ahead=PARTITIONS_AHEAD):
+    """Create the current month's partition, `ahead` months after it, and a
+    partition for any month that has spilled into the DEFAULT partition."""
+    # Serialize with other API processes doing the same check
+    conn.execute(text("SELECT pg_advisory_xact_lock(hashtext(:name))"), {"name": INTERACTION_TABLE})
+
+    first = month_start(today or date.today())
+    months = {add_months(first, offset) for offset in range(ahead + 1)}
+    months |= _months_in_default(conn)
+
+    existing = list_partitions(conn)
+    created = []
+    for month in sorted(months - set(existing)):
+        created.append(create_partition(conn, month))
+    return created
+
+
+def drop_expired_partitions(conn, today=None, retention_months=RETENTION_MONTHS):
+    """Detach and drop whole monthly partitions older than the retention window.
+
+    Dropping a partition is a catalog operation, so the cost does not depend on
+    how many rows it holds (unlike DELETE ... WHERE ts < cutoff).
+    """
+    cutoff = add_months(month_start(today or date.today()), -retention_months)
+    dropped = []
+    for month, name in sorted(list_partitions(conn).items()):
+        if month >= cutoff:
+            continue
+        conn.execute(text(f"ALTER TABLE {INTERACTION_TABLE} DETACH PARTITION {name}"))
+        conn.execute(text(f"DROP TABLE {name}"))
+        dropped.append(name)
+    return dropped
+
+
+def ensure_all_partitions(today=None):
+    created = []
+    for engine in all_engines():
+        with engine.begin() as conn:
+            created += ensure_partitions(conn, today=today)
+    return created
+
+
+async def keep_partitions_ahead(interval=PARTITION_CHECK_SECONDS):
+    """Background task for the API process, so inserts never depend on the cron job alone."""
+    while True:
+        try:
+            await asyncio.to_thread(ensure_all_partitions)
+        except Exception:
+            logger.exception("Could not ensure interaction partitions")
+        await asyncio.sleep(interval)
+
+
+# Intended to run daily (cron / celery beat): python -m profiles.retention
+def run_retention(today=None):
+    created, dropped = [], []
+    # Shared database plus every dedicated tenant database
+    for engine in all_engines():
+        with engine.begin() as conn:
+            created += ensure_partitions(conn, today=today)
+            dropped += drop_expired_partitions(conn, today=today)
+    return {"created": created, "dropped": dropped}
+
+
+if __name__ == "__main__":
+    print(run_retention())
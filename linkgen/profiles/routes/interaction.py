@@ -0,0 +1,89 @@
+import base64
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+from typing import Optional
+from profiles.models.interaction_event import InteractionEvent as InteractionEventModel
+from profiles.schemas.interaction import (
+    InteractionEvent,
+    InteractionEventCreate,
+    InteractionEventPage,
+)
+from profiles.dedup import resolve_profile_id
+from database.db_session import get_db
+
+interaction_router = APIRouter()
+
+
+# Opaque, URL-safe token so it survives being pasted into a query string unencoded
+def _encode_cursor(event):
+    raw = f"{event.ts.isoformat()}|{event.id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        ts, event_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(ts), int(event_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+# Append an interaction event to a profile's history
+@interaction_router.post("/{profile_id}/interactions", response_model=InteractionEvent)
+def create_interaction(
+    profile_id: str, event: InteractionEventCreate, db: Session = Depends(get_db)
+):
+    db_event = InteractionEventModel(profile_id=resolve_profile_id(db, profile_id), **event.model_dump())
+    db.add(db_event)
+    db.commit()
+    db.refresh(db_event)
+    return db_event
+
+
+# Get a profile's interaction history, newest first
+@interaction_router.get("/{profile_id}/interactions", response_model=InteractionEventPage)
+def get_interactions(
+    profile_id: str,
+    db: Session = Depends(get_db),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(None),
+    since: Optional[datetime] = Query(None),
+    event_type: Optional[str] = Query(None),
+):
+    """Keyset-paginated over (ts, id) so deep pages stay as cheap as the first one.
+
+    Passing `since` lets Postgres prune partitions older than that time.
+    """
+    profile_id = resolve_profile_id(db, profile_id)
+    query = db.query(InteractionEventModel).filter(
+        InteractionEventModel.profile_id == profile_id
+    )
+
+    if cursor:
+        before_ts, before_id = _decode_cursor(cursor)
+        query = query.filter(
+            or_(
+                InteractionEventModel.ts < before_ts,
+                and_(InteractionEventModel.ts == before_ts, InteractionEventModel.id < before_id),
+            )
+        )
+    if since:
+        query = query.filter(InteractionEventModel.ts >= since)
+    if event_type:
+        query = query.filter(InteractionEventModel.event_type == event_type)
+
+    events = (
+        query.order_by(InteractionEventModel.ts.desc(), InteractionEventModel.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    has_more = len(events) > limit
+    events = events[:limit]
+    return {
+        "data": [InteractionEvent.model_validate(e) for e in events],
+        "next_cursor": _encode_cursor(events[-1]) if has_more else None,
+    }
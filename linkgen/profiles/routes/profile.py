@@ -1,14 +1,61 @@
-from fastapi import APIRouter
-from profiles.schemas.profile import LinkedInProfile
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
+from typing import List
+from profiles.dedup import (
+    CANDIDATE_THRESHOLD,
+    apply_match_keys,
+    find_matches,
+    resolve_profile_id,
+    upsert_profiles,
+)
+from profiles.models.profile import ProfileModel
+from profiles.schemas.profile import LinkedInProfile, ProfileImportResult, ProfileMatch
+from database.db_session import get_db
 
 profile_router = APIRouter()
 
+@profile_router.post("/import", response_model=ProfileImportResult)
+def import_profiles(profiles: List[LinkedInProfile], db: Session = Depends(get_db)):
+    """Upsert a batch of profiles, merging near-duplicates into existing ones."""
+    return upsert_profiles(db, profiles)
+
+@profile_router.get("/{profile_id}/matches", response_model=List[ProfileMatch])
+def get_profile_matches(
+    profile_id: str,
+    db: Session = Depends(get_db),
+    threshold: float = Query(CANDIDATE_THRESHOLD, ge=0, le=1),
+    limit: int = Query(10, ge=1, le=100),
+):
+    """List likely duplicates of a profile, best match first."""
+    profile_id = resolve_profile_id(db, profile_id)
+    db_profile = db.query(ProfileModel).filter(ProfileModel.id == profile_id).first()
+    if db_profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    matches = find_matches(
+        db, db_profile.name, db_profile.company, threshold=threshold, limit=limit, exclude_id=profile_id
+    )
+    return [{"profile": LinkedInProfile.model_validate(row), "score": round(score, 3)} for row, score in matches]
+
 @profile_router.get("/{profile_id}", response_model=LinkedInProfile)
-def get_profile(profile_id: str):
-    """Fetch a LinkedIn profile by ID."""
-    return {"id": profile_id, "name": "John Doe", "connection_status": "connected", "interaction_history": []}
+def get_profile(profile_id: str, db: Session = Depends(get_db)):
+    """Fetch a LinkedIn profile by ID (merged ids resolve to the surviving profile)."""
+    profile_id = resolve_profile_id(db, profile_id)
+    db_profile = db.query(ProfileModel).filter(ProfileModel.id == profile_id).first()
+    if db_profile is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return db_profile
 
 @profile_router.put("/{profile_id}", response_model=LinkedInProfile)
-def update_profile(profile_id: str, profile: LinkedInProfile):
+def update_profile(profile_id: str, profile: LinkedInProfile, db: Session = Depends(get_db)):
     """Update LinkedIn profile details."""
-    return profile
+    profile_id = resolve_profile_id(db, profile_id)
+    db_profile = db.query(ProfileModel).filter(ProfileModel.id == profile_id).first()
+    if db_profile is None:
+        db_profile = ProfileModel(id=profile_id)
+        db.add(db_profile)
+    for key, value in profile.model_dump(exclude={"id"}).items():
+        setattr(db_profile, key, value)
+    apply_match_keys(db_profile)
+    db.commit()
+    db.refresh(db_profile)
+    return db_profile
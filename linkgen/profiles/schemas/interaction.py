@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from datetime import datetime
+from typing import Optional, List
+
+class InteractionEventBase(BaseModel):
+    event_type: str
+    detail: Optional[str] = None
+
+class InteractionEventCreate(InteractionEventBase):
+    pass
+
+class InteractionEvent(InteractionEventBase):
+    id: int
+    profile_id: str
+    ts: datetime
+
+    class Config:
+        from_attributes = True
+
+class InteractionEventPage(BaseModel):
+    data: List[InteractionEvent]
+    next_cursor: Optional[str] = None
@@ -8,4 +8,20 @@ class LinkedInProfile(BaseModel):
     company: Optional[str] = None
     location: Optional[str] = None
     connection_status: str  # pending, connected, declined
-    interaction_history: List[str]
\ No newline at end of file
+
+    class Config:
+        from_attributes = True
+
+class ProfileMatch(BaseModel):
+    profile: LinkedInProfile
+    score: float
+
+class ProfileMerge(BaseModel):
+    source_id: str
+    profile_id: str
+    score: float
+
+class ProfileImportResult(BaseModel):
+    created: int
+    updated: int
+    merged: List[ProfileMerge]
@@ -0,0 +1,154 @@
+import os
+import unittest
+
+# database.db_session reads its settings at import time
+os.environ.setdefault("DB_PASSWORD", "")
+
+from sqlalchemy import create_engine, text
+
+from database.db_session import TenantSession
+from profiles.dedup import (
+    ProfileIndex,
+    blocking_key,
+    match_keys,
+    normalize_company,
+    normalize_name,
+    resolve_profile_id,
+    trigrams,
+    upsert_profiles,
+)
+from profiles.models.profile_alias import ProfileAlias
+from profiles.schemas.profile import LinkedInProfile
+
+# SQLite stand-ins for the Postgres tables (tsvector column and partitioning left out)
+SCHEMA = [
+    """
+    CREATE TABLE profiles (
+        tenant_id VARCHAR NOT NULL, id VARCHAR NOT NULL, name VARCHAR NOT NULL,
+        headline VARCHAR, company VARCHAR, location VARCHAR, connection_status VARCHAR NOT NULL,
+        name_key VARCHAR NOT NULL, company_key VARCHAR NOT NULL, block_key VARCHAR NOT NULL,
+        search_vector VARCHAR, PRIMARY KEY (tenant_id, id)
+    )
+    """,
+    """
+    CREATE TABLE profile_interactions (
+        id INTEGER NOT NULL, ts DATETIME NOT NULL, tenant_id VARCHAR NOT NULL,
+        profile_id VARCHAR NOT NULL, event_type VARCHAR NOT NULL, detail VARCHAR,
+        PRIMARY KEY (id, ts)
+    )
+    """,
+]
+
+
+def profile(id, name, company=None, headline=None):
+    return LinkedInProfile(id=id, name=name, company=company, headline=headline, connection_status="pending")
+
+
+class MatchKeyTests(unittest.TestCase):
+    def test_normalize_name_strips_accents_punctuation_and_titles(self):
+        self.assertEqual(normalize_name("Dr. José  Smith-Jones, PhD"), "jose smith jones")
+        self.assertEqual(normalize_name(None), "")
+
+    def test_normalize_company_strips_legal_suffixes(self):
+        self.assertEqual(normalize_company("The Acme Corp., Inc."), "acme")
+
+    def test_similar_surnames_share_a_block(self):
+        self.assertEqual(blocking_key("john smith"), "j:smth")
+        self.assertEqual(blocking_key("jon smyth"), blocking_key("john smith"))
+        self.assertNotEqual(blocking_key("john jones"), blocking_key("john smith"))
+        self.assertEqual(blocking_key(""), "")
+
+    def test_trigrams_pad_words_like_pg_trgm(self):
+        self.assertEqual(trigrams("ab"), {"  a", " ab", "ab "})
+        self.assertEqual(trigrams("ab cd"), trigrams("ab") | trigrams("cd"))
+
+
+class ProfileIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = ProfileIndex()
+        for profile_id, name, company in [
+            ("p1", "John Smith", "Acme"),
+            ("p2", "Jon Smyth", "Acme"),
+            ("p3", "John Smith", "Globex"),
+            ("p4", "Jane Doe", "Acme"),
+        ]:
+            self.index.add(profile_id, *match_keys(name, company))
+
+    def test_candidates_are_scored_within_the_block_best_first(self):
+        candidates = self.index.candidates(*match_keys("John Smith", "Acme Inc"), threshold=0.1)
+
+        self.assertEqual([profile_id for profile_id, _ in candidates], ["p1", "p3", "p2"])
+        self.assertEqual(candidates[0][1], 1.0)
+
+    def test_threshold_and_exclude_id(self):
+        keys = match_keys("John Smith", "Acme")
+
+        self.assertEqual([p for p, _ in self.index.candidates(*keys, threshold=0.8)], ["p1"])
+        self.assertEqual(self.index.candidates(*keys, threshold=0.8, exclude_id="p1"), [])
+
+
+class UpsertProfilesTests(unittest.TestCase):
+    def setUp(self):
+        self.engine = create_engine("sqlite://")
+        with self.engine.begin() as conn:
+            for statement in SCHEMA:
+                conn.execute(text(statement))
+        ProfileAlias.__table__.create(self.engine)
+        self.db = TenantSession(bind=self.engine, info={"tenant_id": "acme"})
+        self.addCleanup(self.db.close)
+
+    def query(self, sql, **params):
+        with self.engine.connect() as conn:
+            return conn.execute(text(sql), params).all()
+
+    def test_new_profiles_are_created_and_known_ids_updated(self):
+        upsert_profiles(self.db, [profile("p1", "John Smith", "Acme")])
+        result = upsert_profiles(self.db, [profile("p1", "John Smith", "Acme", headline="CTO")])
+
+        self.assertEqual((result["created"], result["updated"], result["merged"]), (0, 1, []))
+        self.assertEqual(self.query("SELECT headline, tenant_id FROM profiles"), [("CTO", "acme")])
+
+    def test_near_duplicates_in_one_batch_are_merged(self):
+        result = upsert_profiles(
+            self.db,
+            [
+                profile("p1", "John Smith", "Acme"),
+                profile("p2", "Dr. John Smith", "Acme Inc.", headline="CTO"),
+                profile("p3", "Jane Doe", "Acme"),
+            ],
+        )
+
+        self.assertEqual(result["created"], 2)
+        self.assertEqual([(m["source_id"], m["profile_id"]) for m in result["merged"]], [("p2", "p1")])
+        # The surviving profile keeps its values and gains the missing ones
+        self.assertEqual(self.query("SELECT id, headline FROM profiles ORDER BY id"), [("p1", "CTO"), ("p3", None)])
+        self.assertEqual(resolve_profile_id(self.db, "p2"), "p1")
+
+    def test_merge_moves_interactions_to_the_surviving_profile(self):
+        upsert_profiles(self.db, [profile("p1", "John Smith", "Acme")])
+        with self.engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO profile_interactions VALUES (1, '2025-03-01', 'acme', 'p2', 'message_sent', NULL)"
+            ))
+
+        upsert_profiles(self.db, [profile("p2", "John Smith", "Acme")])
+
+        self.assertEqual(self.query("SELECT profile_id FROM profile_interactions"), [("p1",)])
+
+    def test_reimporting_an_alias_updates_the_surviving_profile(self):
+        upsert_profiles(self.db, [profile("p1", "John Smith", "Acme"), profile("p2", "John Smith", "Acme")])
+
+        result = upsert_profiles(self.db, [profile("p2", "John Smith", "Acme", headline="CTO")])
+
+        self.assertEqual((result["created"], result["updated"], result["merged"]), (0, 1, []))
+        self.assertEqual(self.query("SELECT id, headline FROM profiles"), [("p1", "CTO")])
+        self.assertEqual(self.query("SELECT alias_id, profile_id FROM profile_aliases"), [("p2", "p1")])
+
+    def test_aliases_are_per_tenant(self):
+        upsert_profiles(self.db, [profile("p1", "John Smith", "Acme"), profile("p2", "John Smith", "Acme")])
+        other = TenantSession(bind=self.engine, info={"tenant_id": "globex"})
+        self.addCleanup(other.close)
+
+        self.assertEqual(resolve_profile_id(other, "p2"), "p2")
+        result = upsert_profiles(other, [profile("p2", "John Smith", "Acme")])
+        self.assertEqual(result["created"], 1)
@@ -0,0 +1,105 @@
+"""Latency benchmark for the full-text search queries.
+
+Seeds synthetic campaigns, templates and profiles inside a transaction,
+times the same per-type queries the /api/v1/search endpoint runs, then
+rolls everything back. Needs a migrated Postgres database (see README):
+
+    python -m search.benchmark --rows 1000000 --runs 50 --target-ms 50
+
+With --target-ms it exits non-zero when any query's p95 is above the target.
+"""
+import argparse
+import statistics
+import sys
+import time
+from sqlalchemy import func, text
+from database.db_session import TenantSession, engine
+from search.routes.search import SEARCHABLE, search_type
+
+WORDS = [
+    "growth", "outreach", "founders", "saas", "fintech", "hiring", "webinar", "launch",
+    "enterprise", "marketing", "sales", "engineering", "product", "design", "follow",
+    "intro", "partnership", "conference", "demo", "pricing", "renewal", "security",
+]
+
+BENCHMARK_TENANT_ID = "benchmark"
+
+QUERIES = ["saas founders", "engineering hiring", "\"product launch\"", "webinar -pricing", "security"]
+
+
+def _words_sql(count, seed_column):
+    """SQL expression picking `count` pseudo-random words per generated row."""
+    picks = [
+        f"(ARRAY{WORDS!r})[1 + ((({seed_column}) * {31 + i * 17}) % {len(WORDS)})]"
+        for i in range(count)
+    ]
+    return " || ' ' || ".join(picks)
+
+
+def seed(conn, rows):
+    per_type = rows // 3
+    conn.execute(text(
+        f"""
+        INSERT INTO campaigns (tenant_id, title, description, start_date, end_date, status, active)
+        SELECT :tenant, {_words_sql(3, 'g')}, {_words_sql(12, 'g + 7')},
+               current_date, current_date + 30, 'scheduled', true
+        FROM generate_series(1, :n) AS g
+        """
+    ), {"n": per_type, "tenant": BENCHMARK_TENANT_ID})
+    conn.execute(text(
+        f"""
+        INSERT INTO message_templates (tenant_id, name, subject, body)
+        SELECT :tenant, {_words_sql(2, 'g + 3')}, {_words_sql(5, 'g + 11')}, {_words_sql(30, 'g + 13')}
+        FROM generate_series(1, :n) AS g
+        """
+    ), {"n": per_type, "tenant": BENCHMARK_TENANT_ID})
+    conn.execute(text(
+        f"""
+        INSERT INTO profiles (tenant_id, id, name, headline, company, connection_status, name_key, company_key, block_key)
+        SELECT :tenant, 'bench-' || g, 'Person ' || g, {_words_sql(6, 'g + 5')}, {_words_sql(2, 'g + 9')},
+               'pending', '', '', ''
+        FROM generate_series(1, :n) AS g
+        """
+    ), {"n": per_type, "tenant": BENCHMARK_TENANT_ID})
+    conn.execute(text("ANALYZE campaigns; ANALYZE message_templates; ANALYZE profiles"))
+
+
+def run(rows, runs, per_page):
+    """Print p50/p95 per query and return the worst p95 in milliseconds."""
+    worst_p95 = 0.0
+    with engine.connect() as conn:
+        transaction = conn.begin()
+        try:
+            started = time.perf_counter()
+            seed(conn, rows)
+            print(f"seeded {rows} rows in {time.perf_counter() - started:.1f}s")
+
+            db = TenantSession(bind=conn, info={"tenant_id": BENCHMARK_TENANT_ID})
+            for q in QUERIES:
+                tsquery = func.websearch_to_tsquery("english", q)
+                timings = []
+                for _ in range(runs):
+                    started = time.perf_counter()
+                    for type_name in SEARCHABLE:
+                        search_type(db, type_name, tsquery, per_page + 1)
+                    timings.append((time.perf_counter() - started) * 1000)
+                timings.sort()
+                p95 = timings[max(0, int(len(timings) * 0.95) - 1)]
+                print(f"{q!r:24} p50={statistics.median(timings):7.2f} ms  p95={p95:7.2f} ms")
+                worst_p95 = max(worst_p95, p95)
+        finally:
+            transaction.rollback()
+    return worst_p95
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=300_000, help="total rows across the three tables")
+    parser.add_argument("--runs", type=int, default=30, help="timed runs per query")
+    parser.add_argument("--per-page", type=int, default=20)
+    parser.add_argument("--target-ms", type=float, help="fail if any query's p95 exceeds this")
+    args = parser.parse_args()
+    worst_p95 = run(args.rows, args.runs, args.per_page)
+    if args.target_ms is not None and worst_p95 > args.target_ms:
+        print(f"p95 {worst_p95:.2f} ms is above the {args.target_ms:.0f} ms target")
+        sys.exit(1)
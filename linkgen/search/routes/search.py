@@ -0,0 +1,92 @@
+import os
+from dotenv import load_dotenv
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from campaigns.models.campaign import CampaignModel
+from campaigns.models.message_template import MessageTemplate
+from profiles.models.profile import ProfileModel
+from search.schemas.search import SearchResults
+from database.db_session import get_db
+
+# Load environment variables from .env file
+load_dotenv()
+
+search_router = APIRouter()
+
+# type -> (model, title column, summary column)
+SEARCHABLE = {
+    "campaign": (CampaignModel, CampaignModel.title, CampaignModel.description),
+    "template": (MessageTemplate, MessageTemplate.name, MessageTemplate.subject),
+    "profile": (ProfileModel, ProfileModel.name, ProfileModel.headline),
+}
+
+# Deep pages are capped; every page re-ranks the window up to it
+MAX_RESULT_WINDOW = 1000
+# Matches scored per type. A common term can match millions of rows, so only the
+# first this-many rows the GIN index returns are ranked, keeping latency bounded.
+# Past this, results are the best of a sample rather than of every match.
+MAX_RANKED_MATCHES = int(os.getenv("SEARCH_MAX_RANKED_MATCHES", "5000"))
+
+
+def ranked_matches(type_name, tsquery, limit):
+    """SELECT of the top `limit` matches of one type, best first."""
+    model, title, summary = SEARCHABLE[type_name]
+    # The rank is only computed for rows the inner LIMIT lets through
+    candidates = (
+        select(
+            model.id.label("id"),
+            title.label("title"),
+            summary.label("summary"),
+            func.ts_rank_cd(model.search_vector, tsquery).label("rank"),
+        )
+        .where(model.search_vector.op("@@")(tsquery))
+        .limit(MAX_RANKED_MATCHES)
+        .subquery()
+    )
+    return select(candidates).order_by(candidates.c.rank.desc()).limit(limit)
+
+
+def search_type(db, type_name, tsquery, limit):
+    """Top `limit` matches of one type, best first, using its GIN-indexed search_vector."""
+    rows = db.execute(ranked_matches(type_name, tsquery, limit)).all()
+    return [
+        {"type": type_name, "id": row.id, "title": row.title or "", "summary": row.summary, "rank": row.rank}
+        for row in rows
+    ]
+
+
+# Ranked full-text search across campaigns, templates and profiles
+@search_router.get("/", response_model=SearchResults)
+def search(
+    q: str = Query(..., min_length=1),
+    types: str = Query(",".join(SEARCHABLE), description="Comma-separated: campaign,template,profile"),
+    page: int = Query(1, ge=1),
+    per_page: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    selected = [t.strip() for t in types.split(",") if t.strip()]
+    unknown = set(selected) - set(SEARCHABLE)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown search types: {', '.join(sorted(unknown))}")
+
+    offset = (page - 1) * per_page
+    if offset + per_page > MAX_RESULT_WINDOW:
+        raise HTTPException(status_code=400, detail=f"Results are limited to the first {MAX_RESULT_WINDOW} matches")
+
+    # websearch syntax: quoted phrases, OR, and -exclusions
+    tsquery = func.websearch_to_tsquery("english", q)
+
+    # Each type only needs its own top (offset + per_page + 1) to merge the page correctly
+    window = offset + per_page + 1
+    results = []
+    for type_name in selected:
+        results.extend(search_type(db, type_name, tsquery, window))
+    results.sort(key=lambda result: result["rank"], reverse=True)
+
+    return {
+        "data": results[offset:offset + per_page],
+        "page": page,
+        "per_page": per_page,
+        "hasMore": len(results) > offset + per_page,
+    }
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import List, Optional, Union
+
+class SearchResult(BaseModel):
+    type: str  # campaign, template, profile
+    id: Union[int, str]
+    title: str
+    summary: Optional[str] = None
+    rank: float
+
+class SearchResults(BaseModel):
+    data: List[SearchResult]
+    page: int
+    per_page: int
+    hasMore: bool
@@ -0,0 +1,88 @@
+import os
+import unittest
+from unittest import mock
+
+# database.db_session reads its settings at import time
+os.environ.setdefault("DB_PASSWORD", "")
+
+from fastapi import HTTPException
+from sqlalchemy import func
+from sqlalchemy.dialects import postgresql
+
+from search.routes import search as search_module
+from search.routes.search import MAX_RANKED_MATCHES, MAX_RESULT_WINDOW, ranked_matches, search
+
+
+def fake_results(ranks):
+    """search_type stub returning canned matches per type, honouring the limit."""
+    requested = []
+
+    def search_type(db, type_name, tsquery, limit):
+        requested.append((type_name, limit))
+        return [
+            {"type": type_name, "id": f"{type_name}-{i}", "title": "", "summary": None, "rank": rank}
+            for i, rank in enumerate(ranks.get(type_name, []))
+        ][:limit]
+
+    return search_type, requested
+
+
+class SearchRouteTests(unittest.TestCase):
+    def call(self, **params):
+        params = {"q": "saas", "types": "campaign,template,profile", "page": 1, "per_page": 20, **params}
+        return search(db=None, **params)
+
+    def test_unknown_type_is_rejected(self):
+        with self.assertRaises(HTTPException) as raised:
+            self.call(types="campaign,invoice")
+        self.assertEqual(raised.exception.status_code, 400)
+        self.assertIn("invoice", raised.exception.detail)
+
+    def test_pages_past_the_result_window_are_rejected(self):
+        with mock.patch.object(search_module, "search_type", fake_results({})[0]):
+            self.call(page=MAX_RESULT_WINDOW // 20, per_page=20)
+            with self.assertRaises(HTTPException) as raised:
+                self.call(page=MAX_RESULT_WINDOW // 20 + 1, per_page=20)
+        self.assertEqual(raised.exception.status_code, 400)
+
+    def test_merges_types_by_rank_and_paginates(self):
+        search_type, requested = fake_results(
+            {"campaign": [0.9, 0.5, 0.1], "template": [0.8, 0.4], "profile": [0.7, 0.3, 0.2]}
+        )
+        with mock.patch.object(search_module, "search_type", search_type):
+            first = self.call(page=1, per_page=3)
+            second = self.call(page=2, per_page=3)
+            last = self.call(page=3, per_page=3)
+
+        self.assertEqual([r["id"] for r in first["data"]], ["campaign-0", "template-0", "profile-0"])
+        self.assertEqual([r["id"] for r in second["data"]], ["campaign-1", "template-1", "profile-1"])
+        self.assertEqual([r["id"] for r in last["data"]], ["profile-2", "campaign-2"])
+        self.assertTrue(first["hasMore"])
+        self.assertTrue(second["hasMore"])
+        self.assertFalse(last["hasMore"])
+        # Each type is asked for just enough rows to fill the page and detect more
+        self.assertEqual(requested[-3:], [("campaign", 10), ("template", 10), ("profile", 10)])
+
+    def test_only_requested_types_are_searched(self):
+        search_type, requested = fake_results({"campaign": [0.9], "profile": [0.7]})
+        with mock.patch.object(search_module, "search_type", search_type):
+            result = self.call(types=" profile ")
+
+        self.assertEqual([name for name, _ in requested], ["profile"])
+        self.assertEqual([r["id"] for r in result["data"]], ["profile-0"])
+
+
+class RankedMatchesTests(unittest.TestCase):
+    def test_ranking_is_bounded_to_a_limited_candidate_set(self):
+        statement = ranked_matches("campaign", func.websearch_to_tsquery("english", "saas"), 21)
+        compiled = statement.compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+
+        outer = sql[sql.index(") AS anon_1"):]
+
+        # Rank and the candidate limit live in the subquery; the outer query only sorts
+        self.assertLess(sql.index("ts_rank_cd"), sql.index(") AS anon_1"))
+        self.assertIn("LIMIT %(param_1)s) AS anon_1", sql)
+        self.assertIn("ORDER BY anon_1.rank DESC", outer)
+        self.assertEqual(compiled.params["param_1"], MAX_RANKED_MATCHES)
+        self.assertEqual(compiled.params["param_2"], 21)